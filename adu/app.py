@@ -9,6 +9,7 @@ from adu.sqlite_writer import get_sqlite_writer
 from adu.greenplum_pool import get_pool_stats, pool_health_check, get_database_connection as get_pooled_connection, initialize_connection_pool
 from adu.websocket_manager import websocket_manager
 from adu.tasks import execute_export_job
+from adu.worker import is_valid_table_name
 
 app = Flask(__name__)
 
@@ -122,7 +123,13 @@ def get_job_errors(job_id):
     """Get job errors using SQLite writer queue"""
     try:
         sqlite_writer = get_sqlite_writer()
-        query = "SELECT * FROM errors WHERE job_id = ? ORDER BY timestamp DESC"
+        query = """
+            SELECT e.id, e.job_id, e.timestamp, e.error_message,
+                   COALESCE(t.traceback, e.traceback) AS traceback, e.context
+            FROM errors e
+            LEFT JOIN tracebacks t ON t.traceback_hash = e.traceback_hash
+            WHERE e.job_id = ? ORDER BY e.timestamp DESC
+        """
         errors = sqlite_writer.query(query, (job_id,), fetchone=False, timeout=5.0)
         
         errors_list = [dict(row) for row in errors] if errors else []
@@ -454,6 +461,10 @@ def create_job():
         if missing_fields:
             return jsonify({'error': f'Missing required fields: {", ".join(missing_fields)}'}), 400
         
+        invalid_tables = [table for table in data.get('tables', []) if not is_valid_table_name(table)]
+        if invalid_tables:
+            return jsonify({'error': f'Invalid table names: {", ".join(map(str, invalid_tables))}'}), 400
+        
         job_id = str(uuid.uuid4())
         
         # No encryption needed for airgapped environment
@@ -481,6 +492,13 @@ def create_job():
         app.logger.error(f"Error creating job: {str(e)}")
         return jsonify({'error': f'Failed to create job: {str(e)}'}), 500
 
+def _catalog_cache_key(data):
+    """Key discovery results by source database; 'refresh' in the request bypasses the cache"""
+    if data.get('refresh'):
+        return None
+    return (data['db_type'].lower(), data['db_host'], int(data['db_port']),
+            data.get('db_name'), data['db_username'])
+
 @app.route('/api/discover-schema', methods=['POST'])
 def discover_schema():
     """Discover database schema without creating a job"""
@@ -510,7 +528,7 @@ def discover_schema():
         
         # Use connection pool
         with get_pooled_connection() as db_conn:
-            tables = discover_tables(db_conn, data['db_type'])
+            tables = discover_tables(db_conn, data['db_type'], cache_key=_catalog_cache_key(data))
         
         return jsonify({
             'tables': tables,
@@ -537,95 +555,95 @@ def get_table_info():
         if missing_fields:
             return jsonify({'error': f'Missing required fields: {", ".join(missing_fields)}'}), 400
         
-        # Import database functions
-        from .worker import get_database_connection
+        if not is_valid_table_name(data['table_name']):
+            return jsonify({'error': f'Invalid table name: {data["table_name"]}'}), 400
         
-        # Connect to database
-        db_conn = get_database_connection(
+        # Initialize connection pool for this request
+        initialize_connection_pool(
             data['db_type'], 
             data['db_host'], 
             int(data['db_port']), 
             data['db_username'], 
             data['db_password'],
-            data.get('db_name')
+            data.get('db_name') or ('postgres' if data['db_type'].lower() in ['postgresql', 'greenplum'] else 'defaultdb')
         )
         
-        cursor = db_conn.cursor()
-        table_name = data['table_name']
-        
-        # Get table info based on database type
-        if data['db_type'].lower() in ['postgresql', 'greenplum']:
-            # Parse table name to handle schema.table format
-            if '.' in table_name:
-                schema_name, actual_table_name = table_name.split('.', 1)
-            else:
-                schema_name = 'public'
-                actual_table_name = table_name
-                
-            # Get column information - try multiple approaches for better Greenplum compatibility
-            try:
-                cursor.execute("""
-                    SELECT column_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns 
-                    WHERE table_name = %s AND table_schema = %s
-                    ORDER BY ordinal_position
-                """, (actual_table_name, schema_name))
-                columns = [{'name': row[0], 'type': row[1], 'nullable': row[2], 'default': row[3]} for row in cursor.fetchall()]
+        # Use connection pool
+        with get_pooled_connection() as db_conn:
+            cursor = db_conn.cursor()
+            table_name = data['table_name']
+        
+            # Get table info based on database type
+            if data['db_type'].lower() in ['postgresql', 'greenplum']:
+                # Parse table name to handle schema.table format
+                if '.' in table_name:
+                    schema_name, actual_table_name = table_name.split('.', 1)
+                else:
+                    schema_name = 'public'
+                    actual_table_name = table_name
                 
-                # If no columns found and not public schema, try with public schema as fallback
-                if not columns and schema_name != 'public':
+                # Get column information - try multiple approaches for better Greenplum compatibility
+                try:
                     cursor.execute("""
                         SELECT column_name, data_type, is_nullable, column_default
                         FROM information_schema.columns 
-                        WHERE table_name = %s AND table_schema = 'public'
+                        WHERE table_name = %s AND table_schema = %s
                         ORDER BY ordinal_position
-                    """, (actual_table_name,))
+                    """, (actual_table_name, schema_name))
                     columns = [{'name': row[0], 'type': row[1], 'nullable': row[2], 'default': row[3]} for row in cursor.fetchall()]
+                
+                    # If no columns found and not public schema, try with public schema as fallback
+                    if not columns and schema_name != 'public':
+                        cursor.execute("""
+                            SELECT column_name, data_type, is_nullable, column_default
+                            FROM information_schema.columns 
+                            WHERE table_name = %s AND table_schema = 'public'
+                            ORDER BY ordinal_position
+                        """, (actual_table_name,))
+                        columns = [{'name': row[0], 'type': row[1], 'nullable': row[2], 'default': row[3]} for row in cursor.fetchall()]
                     
-                # If still no columns, try without schema restriction (for Greenplum compatibility)
-                if not columns:
-                    cursor.execute("""
-                        SELECT column_name, data_type, is_nullable, column_default
-                        FROM information_schema.columns 
-                        WHERE table_name = %s
-                        ORDER BY ordinal_position
-                    """, (actual_table_name,))
-                    columns = [{'name': row[0], 'type': row[1], 'nullable': row[2], 'default': row[3]} for row in cursor.fetchall()]
+                    # If still no columns, try without schema restriction (for Greenplum compatibility)
+                    if not columns:
+                        cursor.execute("""
+                            SELECT column_name, data_type, is_nullable, column_default
+                            FROM information_schema.columns 
+                            WHERE table_name = %s
+                            ORDER BY ordinal_position
+                        """, (actual_table_name,))
+                        columns = [{'name': row[0], 'type': row[1], 'nullable': row[2], 'default': row[3]} for row in cursor.fetchall()]
                     
-            except Exception as e:
-                app.logger.warning(f"Failed to get column info from information_schema: {e}")
-                # Fallback: try to get columns directly from the table
+                except Exception as e:
+                    app.logger.warning(f"Failed to get column info from information_schema: {e}")
+                    # Fallback: try to get columns directly from the table
+                    try:
+                        cursor.execute(f"SELECT * FROM {table_name} LIMIT 0")
+                        columns = [{'name': desc[0], 'type': 'unknown', 'nullable': 'YES', 'default': None} 
+                                  for desc in cursor.description]
+                    except Exception as e2:
+                        app.logger.error(f"Failed to get column info via direct query: {e2}")
+                        columns = []
+            
+                # Get row count
                 try:
-                    cursor.execute(f"SELECT * FROM {table_name} LIMIT 0")
-                    columns = [{'name': desc[0], 'type': 'unknown', 'nullable': 'YES', 'default': None} 
-                              for desc in cursor.description]
-                except Exception as e2:
-                    app.logger.error(f"Failed to get column info via direct query: {e2}")
-                    columns = []
+                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                    row_count = cursor.fetchone()[0]
+                except Exception as e:
+                    app.logger.warning(f"Failed to get row count: {e}")
+                    row_count = 0
             
-            # Get row count
-            try:
+            elif data['db_type'].lower() == 'vertica':
+                # Get column information
+                cursor.execute("""
+                    SELECT column_name, data_type, is_nullable, column_default
+                    FROM v_catalog.columns 
+                    WHERE table_name = %s AND schema_name = 'public'
+                    ORDER BY ordinal_position
+                """, (table_name,))
+                columns = [{'name': row[0], 'type': row[1], 'nullable': row[2], 'default': row[3]} for row in cursor.fetchall()]
+            
+                # Get row count
                 cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
                 row_count = cursor.fetchone()[0]
-            except Exception as e:
-                app.logger.warning(f"Failed to get row count: {e}")
-                row_count = 0
-            
-        elif data['db_type'].lower() == 'vertica':
-            # Get column information
-            cursor.execute("""
-                SELECT column_name, data_type, is_nullable, column_default
-                FROM v_catalog.columns 
-                WHERE table_name = %s AND schema_name = 'public'
-                ORDER BY ordinal_position
-            """, (table_name,))
-            columns = [{'name': row[0], 'type': row[1], 'nullable': row[2], 'default': row[3]} for row in cursor.fetchall()]
-            
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
-        
-        db_conn.close()
         
         # Calculate partitioning information
         chunk_size = data.get('chunk_size', 1000000)
@@ -681,7 +699,7 @@ def discover_database_schemas():
         
         # Use connection pool
         with get_pooled_connection() as db_conn:
-            schemas = discover_schemas(db_conn, data['db_type'])
+            schemas = discover_schemas(db_conn, data['db_type'], cache_key=_catalog_cache_key(data))
         
         return jsonify({
             'schemas': schemas,
@@ -724,7 +742,8 @@ def discover_schema_tables():
         # Use connection pool
         schema_name = data.get('schema_name')  # Optional - if not provided, returns all tables
         with get_pooled_connection() as db_conn:
-            tables = discover_tables_by_schema(db_conn, data['db_type'], schema_name)
+            tables = discover_tables_by_schema(db_conn, data['db_type'], schema_name,
+                                               cache_key=_catalog_cache_key(data))
         
         # Group tables by schema for better organization
         schemas_dict = {}
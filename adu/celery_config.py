@@ -21,8 +21,12 @@ class CeleryConfig:
     timezone = None  # Uses system timezone
     enable_utc = False
     
-    # Task routing
+    # Task routing: short status/cancel tasks get their own queue so they are
+    # never stuck behind long-running exports (served by a threads-pool worker)
     task_routes = {
+        'adu.tasks.get_job_status': {'queue': 'job_control'},
+        'adu.tasks.get_job_statuses': {'queue': 'job_control'},
+        'adu.tasks.cancel_job': {'queue': 'job_control'},
         'adu.tasks.*': {'queue': 'export_jobs'},
     }
     
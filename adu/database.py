@@ -6,12 +6,19 @@ DB_FILE = os.environ.get('ADU_DB_PATH', '/tmp/adu.db')
 def get_db_connection():
     conn = sqlite3.connect(DB_FILE)
     conn.row_factory = sqlite3.Row
+    # Wait for the SQLite writer's lock instead of failing with SQLITE_BUSY
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 def init_db():
     conn = get_db_connection()
     cursor = conn.cursor()
 
+    # WAL is persistent in the database file, so readers stop blocking the writer from here on
+    cursor.execute("PRAGMA journal_mode=WAL")
+
     # Create jobs table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS jobs (
@@ -44,6 +51,7 @@ def init_db():
             error_message TEXT,
             traceback TEXT,
             context TEXT,
+            traceback_hash TEXT,
             FOREIGN KEY (job_id) REFERENCES jobs (job_id)
         )
     ''')
@@ -5,6 +5,8 @@ This module provides comprehensive mappings between database types and Polars ty
 for PostgreSQL, Greenplum, and Vertica databases.
 """
 
+from functools import lru_cache
+
 import polars as pl
 
 # PostgreSQL/Greenplum Type Mappings
@@ -184,6 +186,7 @@ def get_type_mapping(db_type):
         # Default to PostgreSQL mapping
         return POSTGRESQL_TYPE_MAPPING
 
+@lru_cache(maxsize=1024)
 def map_database_type_to_polars(database_type, db_type='postgresql'):
     """
     Map a single database type to its corresponding Polars type
@@ -194,6 +197,9 @@ def map_database_type_to_polars(database_type, db_type='postgresql'):
         
     Returns:
         polars.DataType: The corresponding Polars data type
+    
+    Results are memoized: wide tables repeat a handful of type names, and
+    unknown types otherwise fall through a scan of every mapped prefix.
     """
     type_mapping = get_type_mapping(db_type)
     
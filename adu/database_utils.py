@@ -6,6 +6,7 @@ to avoid circular imports between worker.py and other modules.
 """
 
 import logging
+import threading
 import psycopg2
 import vertica_python
 from adu.database_type_mappings import create_polars_schema_from_database_metadata
@@ -42,6 +43,100 @@ def create_data_source_connection(db_config, db_type):
         raise ValueError(f"Unsupported database type for data source: {db_type}")
 
 
+# Polars schemas (prefetched or looked up) per data source (host, port, database),
+# each keyed by (db_type, lowercased schema.table)
+_schema_cache = {}
+_schema_cache_lock = threading.Lock()
+
+# Tables per catalog query when prefetching; keeps the IN list a reasonable size
+SCHEMA_PREFETCH_BATCH_SIZE = 500
+
+
+def _schema_source(db_conn):
+    """
+    Identify the database a connection points at, as (host, port, database)
+    
+    Returns None when the connection does not say, so its schemas are never
+    cached where a connection to another database could read them.
+    """
+    info = getattr(db_conn, 'info', None)
+    if info is not None and hasattr(info, 'dbname'):
+        # psycopg2 connection
+        source = info.host, info.port, info.dbname
+    else:
+        # vertica_python connection
+        options = getattr(db_conn, 'options', None) or {}
+        source = options.get('host'), options.get('port'), options.get('database')
+    return source if source[2] else None
+
+
+def _schema_cache_key(db_type, table_name):
+    """Normalize a table name the way get_table_schema parses it (default schema public)"""
+    if '.' not in table_name:
+        table_name = f"public.{table_name}"
+    return db_type.lower(), table_name.lower()
+
+
+def prefetch_table_schemas(db_conn, db_type, table_names):
+    """
+    Fetch column metadata for many tables in one catalog query per batch
+    
+    Replaces the connection's source entries in the cache with the Polars
+    schemas of the given tables, so later get_table_schema calls for them
+    (per table, and per chunk in range chunking) skip the catalog. Entries
+    of other sources are left alone, so jobs exporting from different
+    databases never see each other's schemas. Tables the query misses are
+    left to get_table_schema's own lookup and fallbacks, which cache their
+    result.
+    
+    Returns:
+        int: Number of tables whose schema was cached
+    """
+    source = _schema_source(db_conn)
+    if source is None:
+        logging.info("Skipping schema prefetch, connection does not identify its database")
+        return 0
+    with _schema_cache_lock:
+        _schema_cache.pop(source, None)
+    
+    keys = sorted({_schema_cache_key(db_type, name)[1] for name in table_names})
+    if db_type.lower() in ['postgresql', 'greenplum']:
+        catalog = "information_schema.columns"
+        schema_column = "table_schema"
+    elif db_type.lower() == 'vertica':
+        catalog = "v_catalog.columns"
+        schema_column = "schema_name"
+    else:
+        raise ValueError(f"Unsupported database type: {db_type}")
+    
+    columns_by_table = {}
+    cursor = db_conn.cursor()
+    try:
+        for start in range(0, len(keys), SCHEMA_PREFETCH_BATCH_SIZE):
+            batch = keys[start:start + SCHEMA_PREFETCH_BATCH_SIZE]
+            cursor.execute(f"""
+                SELECT LOWER({schema_column}) || '.' || LOWER(table_name),
+                       column_name, data_type, character_maximum_length, is_nullable
+                FROM {catalog}
+                WHERE LOWER({schema_column}) || '.' || LOWER(table_name) IN ({', '.join(['%s'] * len(batch))})
+                ORDER BY 1, ordinal_position
+            """, batch)
+            for row in cursor.fetchall():
+                columns_by_table.setdefault(row[0], []).append(tuple(row[1:]))
+    finally:
+        cursor.close()
+    
+    schemas = {
+        (db_type.lower(), table): create_polars_schema_from_database_metadata(columns, db_type)
+        for table, columns in columns_by_table.items()
+    }
+    with _schema_cache_lock:
+        _schema_cache.setdefault(source, {}).update(schemas)
+    
+    logging.info("Prefetched schemas for %d of %d tables", len(schemas), len(keys))
+    return len(schemas)
+
+
 def get_table_schema(db_conn, db_type, table_name):
     """
     Get the schema (column information) for a specific table
@@ -54,6 +149,12 @@ def get_table_schema(db_conn, db_type, table_name):
     Returns:
         dict: Polars schema mapping column names to types
     """
+    source = _schema_source(db_conn)
+    with _schema_cache_lock:
+        cached = _schema_cache.get(source, {}).get(_schema_cache_key(db_type, table_name)) if source else None
+    if cached is not None:
+        return dict(cached)
+    
     cursor = db_conn.cursor()
     
     try:
@@ -85,9 +186,12 @@ def get_table_schema(db_conn, db_type, table_name):
         
         # Create Polars schema from database metadata
         polars_schema = create_polars_schema_from_database_metadata(columns_metadata, db_type)
+        if source is not None:
+            with _schema_cache_lock:
+                _schema_cache.setdefault(source, {})[_schema_cache_key(db_type, table_name)] = polars_schema
         
         logging.info(f"Retrieved schema for {table_name}: {len(columns_metadata)} columns")
-        return polars_schema
+        return dict(polars_schema)
         
     except Exception as e:
         logging.error(f"Failed to get schema for table {table_name}: {str(e)}")
@@ -105,8 +209,10 @@ def _verify_table_exists(cursor, db_type, schema_name, table_only, full_table_na
         if db_type.lower() in ['postgresql', 'greenplum']:
             # Check if table exists (case-insensitive)
             cursor.execute("""
-                SELECT 1 FROM information_schema.tables 
-                WHERE LOWER(table_schema) = LOWER(%s) AND LOWER(table_name) = LOWER(%s)
+                SELECT 1 FROM pg_catalog.pg_class c
+                JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+                WHERE LOWER(n.nspname) = LOWER(%s) AND LOWER(c.relname) = LOWER(%s)
+                AND c.relkind IN ('r', 'p', 'v', 'f')
                 LIMIT 1
             """, (schema_name, table_only))
         elif db_type.lower() == 'vertica':
@@ -188,4 +294,25 @@ def _get_schema_fallback(cursor, schema_name, table_only, full_table_name):
         
     except Exception as e:
         logging.error(f"Fallback schema query failed for {full_table_name}: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+
+def estimate_row_count(cursor, table_name):
+    """
+    Planner row estimate for a PostgreSQL/Greenplum table, for sizing chunks
+    
+    Reads pg_class.reltuples instead of scanning the table. Falls back to an
+    exact COUNT(*) when the table has no statistics yet (reltuples is -1 on
+    PostgreSQL 14+ and 0 on older versions and partitioned parents).
+    
+    Returns:
+        int: Estimated number of rows
+    """
+    cursor.execute("SELECT reltuples::bigint FROM pg_catalog.pg_class WHERE oid = %s::regclass",
+                   (table_name,))
+    row = cursor.fetchone()
+    if row and row[0] and row[0] > 0:
+        return row[0]
+    
+    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+    return cursor.fetchone()[0]
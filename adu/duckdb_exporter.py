@@ -11,14 +11,26 @@ import logging
 import os
 import polars as pl
 import psutil
+import pyarrow.parquet as pq
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from adu.database_type_mappings import POSTGRESQL_TYPE_MAPPING, VERTICA_TYPE_MAPPING
+from adu.greenplum_performance_config import GREENPLUM_LARGE_TABLE_CONFIG
 
 
 logger = logging.getLogger(__name__)
 
+# zstd level 1 writes noticeably smaller files than snappy at similar CPU cost;
+# DuckDB dictionary-encodes low-cardinality columns on its own. Row groups follow
+# the output config instead of DuckDB's ~122k-row default, giving readers fewer,
+# better-compressed groups with min/max statistics to prune on.
+PARQUET_ROW_GROUP_SIZE = GREENPLUM_LARGE_TABLE_CONFIG['output']['row_group_size']
+PARQUET_COPY_OPTIONS = (
+    "FORMAT PARQUET, COMPRESSION 'zstd', COMPRESSION_LEVEL 1, "
+    f"ROW_GROUP_SIZE {PARQUET_ROW_GROUP_SIZE}"
+)
+
 
 def map_polars_to_duckdb_type(polars_type) -> str:
     """Map Polars types to DuckDB SQL cast types for schema enforcement"""
@@ -224,7 +236,7 @@ def export_table_chunk_duckdb(
             SELECT {columns_sql} 
             FROM remote_db.{table_name} 
             {where_clause}
-        ) TO '{output_path}' (FORMAT PARQUET, COMPRESSION 'snappy')
+        ) TO '{output_path}' ({PARQUET_COPY_OPTIONS})
         """
         
         logger.info(f"Executing DuckDB export query for {table_name} chunk")
@@ -307,7 +319,7 @@ def export_small_table_duckdb(
         COPY (
             SELECT {columns_sql} 
             FROM remote_db.{table_name}
-        ) TO '{output_path}' (FORMAT PARQUET, COMPRESSION 'snappy')
+        ) TO '{output_path}' ({PARQUET_COPY_OPTIONS})
         """
         
         logger.info(f"Executing DuckDB full table export for {table_name}")
@@ -363,21 +375,23 @@ def validate_duckdb_export(
         if not output_path.exists():
             return False, f"Export file does not exist: {output_path}"
         
-        # Read back the exported Parquet file
-        df = pl.read_parquet(output_path)
-        actual_rows = len(df)
+        # Row count and schema come from one read of the Parquet footer; the data
+        # itself is never loaded, so validation memory does not grow with the table
+        parquet_metadata = pq.read_metadata(output_path)
+        actual_rows = parquet_metadata.num_rows
         
         # Row count validation
         if actual_rows != expected_rows:
             return False, f"Row count mismatch: expected {expected_rows}, got {actual_rows}"
         
-        # Basic data validation using existing validation logic
-        from adu.worker import validate_data
-        validation_passed, validation_message = validate_data(df, table_name)
-        
-        if not validation_passed:
-            logger.warning(f"DuckDB export validation warning for {table_name}: {validation_message}")
-            return True, f"Export successful with validation warnings: {validation_message}"
+        # Column validation against the source schema
+        if polars_schema:
+            exported_columns = set(parquet_metadata.schema.to_arrow_schema().names)
+            missing_columns = [col for col in polars_schema if col not in exported_columns]
+            if missing_columns:
+                validation_message = f"Missing columns: {', '.join(missing_columns)}"
+                logger.warning(f"DuckDB export validation warning for {table_name}: {validation_message}")
+                return True, f"Export successful with validation warnings: {validation_message}"
         
         return True, f"Export validation passed: {actual_rows} rows verified"
         
@@ -7,11 +7,11 @@ Replaces complex Polars cursor streaming with efficient DuckDB native streaming
 import time
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, Callable
 from dataclasses import dataclass
 
 from adu.enhanced_logger import logger
-from adu.duckdb_exporter import create_duckdb_connection, check_memory_safety
+from adu.duckdb_exporter import create_duckdb_connection, check_memory_safety, PARQUET_ROW_GROUP_SIZE
 
 
 @dataclass
@@ -20,7 +20,9 @@ class DuckDBStreamingConfig:
     # PERFORMANCE OPTIMIZATION: Larger chunks for better throughput on 100M+ row tables
     chunk_size_rows: int = 10000000  # OPTIMIZED: 10M rows per chunk (was 5M) for better Greenplum performance
     max_chunks: int = 500            # INCREASED: Allow more chunks for very large tables
-    compression: str = 'snappy'      # Fast compression for speed
+    compression: str = 'zstd'        # Smaller files than snappy at similar speed
+    compression_level: int = 1
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE
     use_chunking_threshold: int = 20000000   # REDUCED: Use chunking for tables > 20M rows (was 50M)
     offset_performance_threshold: int = 50000000  # OPTIMIZED: OFFSET becomes slow above 50M rows (was 100M)
     memory_check_interval: int = 5   # OPTIMIZED: Check memory more frequently for large tables
@@ -33,10 +35,12 @@ class DuckDBStreamer:
     Eliminates Python memory overhead by streaming directly from database to Parquet
     """
     
-    def __init__(self, table_name: str, job_id: str, db_config: Dict[str, Any]):
+    def __init__(self, table_name: str, job_id: str, db_config: Dict[str, Any],
+                 should_cancel: Optional[Callable[[], bool]] = None):
         self.table_name = table_name
         self.job_id = job_id
         self.db_config = db_config
+        self.should_cancel = should_cancel
         self.config = DuckDBStreamingConfig()
         
         # Statistics tracking
@@ -85,7 +89,7 @@ class DuckDBStreamer:
             export_query = f"""
                 COPY ({select_query}) 
                 TO '{output_file}' 
-                (FORMAT PARQUET, COMPRESSION '{self.config.compression}')
+                (FORMAT PARQUET, COMPRESSION '{self.config.compression}', COMPRESSION_LEVEL {self.config.compression_level}, ROW_GROUP_SIZE {self.config.row_group_size})
             """
             
             logger.info(f"Executing DuckDB streaming export: {self.table_name}")
@@ -159,6 +163,10 @@ class DuckDBStreamer:
             total_rows = 0
             
             while chunk_num < self.config.max_chunks:
+                if self.should_cancel and self.should_cancel():
+                    logger.info(f"DuckDB chunked streaming of {self.table_name} cancelled after {chunk_num} chunks")
+                    return False, total_rows, chunk_files
+                
                 # Memory safety check every N chunks
                 if chunk_num % self.config.memory_check_interval == 0:
                     memory_safe, memory_msg = check_memory_safety()
@@ -261,7 +269,7 @@ class DuckDBStreamer:
             export_query = f"""
                 COPY ({query}) 
                 TO '{chunk_file}' 
-                (FORMAT PARQUET, COMPRESSION '{self.config.compression}')
+                (FORMAT PARQUET, COMPRESSION '{self.config.compression}', COMPRESSION_LEVEL {self.config.compression_level}, ROW_GROUP_SIZE {self.config.row_group_size})
             """
             
             result = duck_conn.execute(export_query)
@@ -283,7 +291,8 @@ def export_large_table_with_duckdb_streaming(
     output_dir: Path,
     db_config: Dict[str, Any],
     select_query: Optional[str] = None,
-    estimated_rows: int = 0
+    estimated_rows: int = 0,
+    should_cancel: Optional[Callable[[], bool]] = None
 ) -> Tuple[bool, int]:
     """
     Export large table using DuckDB streaming - replaces Polars cursor streaming
@@ -295,6 +304,7 @@ def export_large_table_with_duckdb_streaming(
         db_config: Database connection configuration
         select_query: Optional custom SELECT query
         estimated_rows: Estimated row count for chunking decisions
+        should_cancel: Called between chunks; chunked streaming stops once it returns True
         
     Returns:
         Tuple of (success: bool, total_rows_exported: int)
@@ -304,7 +314,7 @@ def export_large_table_with_duckdb_streaming(
     logger.info(f"Estimated rows: {estimated_rows:,}" if estimated_rows > 0 else "Estimated rows: unknown")
     
     # Create streamer instance
-    streamer = DuckDBStreamer(table_name, job_id, db_config)
+    streamer = DuckDBStreamer(table_name, job_id, db_config, should_cancel)
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Decision: single file vs chunked based on estimated size
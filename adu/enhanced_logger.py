@@ -207,29 +207,32 @@ class EnhancedLogger:
         
         return "[" + "] [".join(parts) + "]" if parts else ""
     
-    def info(self, message: str, **kwargs):
-        """Log info message with context"""
+    def _log(self, level: int, message: str, args: tuple, kwargs: Dict[str, Any]):
+        """Prefix and emit a message, skipping all formatting when the level is disabled"""
+        if not self.logger.isEnabledFor(level):
+            return
+        if args:
+            # Format before prefixing: the prefix itself may contain '%'
+            message = message % args
         prefix = self._build_context_prefix()
         full_message = f"{prefix} {message}" if prefix else message
-        self.logger.info(full_message, **kwargs)
+        self.logger.log(level, full_message, **kwargs)
+    
+    def info(self, message: str, *args, **kwargs):
+        """Log info message with context"""
+        self._log(logging.INFO, message, args, kwargs)
     
-    def warning(self, message: str, **kwargs):
+    def warning(self, message: str, *args, **kwargs):
         """Log warning message with context"""
-        prefix = self._build_context_prefix()
-        full_message = f"{prefix} {message}" if prefix else message
-        self.logger.warning(full_message, **kwargs)
+        self._log(logging.WARNING, message, args, kwargs)
     
-    def error(self, message: str, **kwargs):
+    def error(self, message: str, *args, **kwargs):
         """Log error message with context"""
-        prefix = self._build_context_prefix()
-        full_message = f"{prefix} {message}" if prefix else message
-        self.logger.error(full_message, **kwargs)
+        self._log(logging.ERROR, message, args, kwargs)
     
-    def debug(self, message: str, **kwargs):
+    def debug(self, message: str, *args, **kwargs):
         """Log debug message with context"""
-        prefix = self._build_context_prefix()
-        full_message = f"{prefix} {message}" if prefix else message
-        self.logger.debug(full_message, **kwargs)
+        self._log(logging.DEBUG, message, args, kwargs)
     
     # Job-level logging methods
     def job_started(self, job_id: str, total_tables: int, total_rows: int = 0):
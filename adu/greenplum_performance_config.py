@@ -34,7 +34,7 @@ GREENPLUM_LARGE_TABLE_CONFIG = {
         'chunk_size_rows': 10000000,     # OPTIMIZED: 10M rows per chunk
         'single_file_threshold': 100000000,  # Use single file for < 100M rows
         'offset_threshold': 50000000,    # CRITICAL: Avoid OFFSET above 50M rows
-        'compression': 'snappy',         # Fast compression
+        'compression': 'zstd',           # zstd level 1: smaller than snappy, similar speed
         'memory_check_interval': 5,      # Check memory every 5 chunks
     },
     
@@ -67,7 +67,7 @@ GREENPLUM_LARGE_TABLE_CONFIG = {
     
     # File output optimizations
     'output': {
-        'compression': 'snappy',         # Fast compression for speed
+        'compression': 'zstd',           # zstd level 1: smaller than snappy, similar speed
         'row_group_size': 1000000,       # 1M rows per row group
         'page_size': 1048576,           # 1MB page size
         'target_file_size_mb': 400,     # Target 400MB files for large tables
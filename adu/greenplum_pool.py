@@ -122,6 +122,7 @@ class GreenplumConnectionPool:
         self._pool_lock = threading.Lock()
         self._connection_count = 0
         self._active_connections = {}  # connection_id -> (connection, start_time)
+        self._idle_connections = []  # Released Vertica connections kept for reuse
         
         # Statistics
         self._stats = {
@@ -174,6 +175,47 @@ class GreenplumConnectionPool:
             connection_timeout=self.config.connect_timeout
         )
     
+    def _take_idle_connection(self):
+        """Pop an idle Vertica connection, or None when there is none (caller holds the lock)"""
+        return self._idle_connections.pop() if self._idle_connections else None
+    
+    def _acquire_vertica_connection(self):
+        """
+        Reuse a healthy idle Vertica connection, closing any that went stale,
+        or open a new one. The health check is a round trip, so only the pop
+        from the idle list happens under the pool lock.
+        """
+        while True:
+            with self._pool_lock:
+                connection = self._take_idle_connection()
+            if connection is None:
+                return self._create_vertica_connection()
+            try:
+                self._test_connection(connection)
+                return connection
+            except Exception:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+    
+    def _reset_vertica_connection(self, connection):
+        """
+        Roll back a released Vertica connection so no open transaction leaks to
+        the next borrower (psycopg2's putconn does the same). Returns None after
+        closing the connection if the rollback fails.
+        """
+        try:
+            connection.rollback()
+            return connection
+        except Exception as e:
+            logger.warning(f"Discarding Vertica connection that failed to roll back: {e}")
+            try:
+                connection.close()
+            except Exception:
+                pass
+            return None
+    
     @contextmanager
     def get_connection(self, timeout: float = 30.0):
         """
@@ -196,15 +238,20 @@ class GreenplumConnectionPool:
         
         try:
             # Acquire connection
-            with self._pool_lock:
-                if self.config.db_type.lower() in ['postgresql', 'greenplum']:
+            if self.config.db_type.lower() in ['postgresql', 'greenplum']:
+                with self._pool_lock:
                     if self._pool is None:
                         raise Exception("Connection pool not initialized")
                     connection = self._pool.getconn()
-                else:
-                    # Manual connection for Vertica
-                    connection = self._create_vertica_connection()
                 
+                # Test connection health (a round trip, so outside the pool lock)
+                self._test_connection(connection)
+            else:
+                # Manual connection for Vertica, reusing an idle session when one is alive;
+                # it has already been health-checked
+                connection = self._acquire_vertica_connection()
+            
+            with self._pool_lock:
                 # Track connection
                 self._active_connections[connection_id] = (connection, start_time)
                 self._connection_count += 1
@@ -215,9 +262,6 @@ class GreenplumConnectionPool:
             
             logger.connection_acquired(connection_id, self._stats['current_active'])
             
-            # Test connection health
-            self._test_connection(connection)
-            
             yield connection
             
             # Record successful operation
@@ -244,9 +288,18 @@ class GreenplumConnectionPool:
                 duration = time.time() - start_time
                 
                 try:
+                    is_pooled = self.config.db_type.lower() in ['postgresql', 'greenplum']
+                    if not is_pooled:
+                        connection = self._reset_vertica_connection(connection)
+                    
                     with self._pool_lock:
-                        if self.config.db_type.lower() in ['postgresql', 'greenplum']:
+                        if is_pooled:
                             self._pool.putconn(connection)
+                        elif connection is None:
+                            pass  # Closed after a failed rollback
+                        elif len(self._idle_connections) < self.max_connections:
+                            # vertica_python has no pool of its own; keep the session open
+                            self._idle_connections.append(connection)
                         else:
                             connection.close()
                         
@@ -339,6 +392,14 @@ class GreenplumConnectionPool:
             self._active_connections.clear()
             self._connection_count = 0
             
+            # Close idle Vertica connections
+            for conn in self._idle_connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.error(f"Error closing idle connection: {e}")
+            self._idle_connections.clear()
+            
             # Close pool
             if self._pool:
                 try:
@@ -370,7 +431,11 @@ def get_connection_pool(config: ConnectionConfig = None) -> GreenplumConnectionP
 
 def initialize_connection_pool(db_type: str, host: str, port: int, username: str, 
                              password: str, database: str, max_connections: int = 6):
-    """Initialize the global connection pool with configuration"""
+    """Initialize the global connection pool with configuration
+    
+    An existing pool for the same database and credentials is reused, so
+    consecutive jobs and discovery requests keep their open connections.
+    """
     config = ConnectionConfig(
         db_type=db_type,
         host=host, 
@@ -382,6 +447,9 @@ def initialize_connection_pool(db_type: str, host: str, port: int, username: str
     
     global _connection_pool
     with _pool_lock:
+        if (_connection_pool is not None and _connection_pool.config == config
+                and _connection_pool.max_connections == max_connections):
+            return _connection_pool
         _connection_pool = GreenplumConnectionPool(config, max_connections=max_connections)
     
     logger.info(f"Initialized global connection pool for {db_type} at {host}:{port}")
@@ -3,7 +3,7 @@ Parallel DuckDB export functions
 """
 import logging
 from pathlib import Path
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from adu.duckdb_exporter import export_table_chunk_duckdb
 
@@ -131,7 +131,8 @@ def export_large_table_with_duckdb_parallel(
     table_dir: Path,
     source_row_count: int,
     chunk_size: int,
-    max_workers: int = 8
+    max_workers: int = 8,
+    should_cancel: Optional[Callable[[], bool]] = None
 ) -> Tuple[bool, int]:
     """
     Export large table using parallel DuckDB chunked approach
@@ -143,6 +144,7 @@ def export_large_table_with_duckdb_parallel(
         source_row_count: Total number of rows in source table
         chunk_size: Number of rows per chunk
         max_workers: Maximum number of concurrent workers
+        should_cancel: Called between chunks; the export stops once it returns True
         
     Returns:
         Tuple of (success: bool, total_exported_rows: int)
@@ -153,13 +155,13 @@ def export_large_table_with_duckdb_parallel(
     polars_schema = None
     try:
         # Import here to avoid circular imports
-        from adu.database_utils import create_data_source_connection, get_table_schema
+        from adu.database_utils import get_table_schema
+        from adu.greenplum_pool import get_database_connection
         
-        # Create temporary connection for schema detection
+        # Borrow a pooled connection for schema detection instead of opening one
         db_type = db_config.get('db_type', 'postgresql')
-        temp_conn = create_data_source_connection(db_config, db_type)
-        polars_schema = get_table_schema(temp_conn, db_type, table_name)
-        temp_conn.close()
+        with get_database_connection() as db_conn:
+            polars_schema = get_table_schema(db_conn, db_type, table_name)
         
         if polars_schema:
             logger.info(f"Retrieved schema for {table_name}: {len(polars_schema)} columns")
@@ -202,6 +204,13 @@ def export_large_table_with_duckdb_parallel(
             # Collect results as they complete
             completed = 0
             for future in as_completed(future_to_chunk):
+                # Chunks not started yet are dropped, running ones finish first
+                if should_cancel and should_cancel():
+                    for pending in future_to_chunk:
+                        pending.cancel()
+                    logger.info(f"Parallel DuckDB export of {table_name} cancelled after {completed}/{total_chunks} chunks")
+                    return False, total_exported_rows
+                
                 chunk_num = future_to_chunk[future]
                 completed += 1
                 
@@ -7,14 +7,14 @@ Uses WHERE clauses with ranges instead of OFFSET for constant performance per ch
 import time
 import polars as pl
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List, Union
+from typing import Dict, Any, Optional, Tuple, List, Union, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 
 from adu.enhanced_logger import logger
 from adu.greenplum_pool import get_database_connection
 from adu.duckdb_exporter import export_table_chunk_duckdb
-from adu.database_utils import get_table_schema, create_data_source_connection
+from adu.database_utils import get_table_schema, create_data_source_connection, estimate_row_count
 
 
 @dataclass
@@ -49,85 +49,81 @@ class RangeAnalyzer:
             with get_database_connection() as db_conn:
                 cursor = db_conn.cursor()
                 
-                # Get column information from information_schema
+                # Get column information from information_schema; scoped to the table's
+                # schema, since every column returned goes into one aggregate query
+                schema_name, _, table_only = self.table_name.rpartition('.')
                 cursor.execute("""
                     SELECT column_name, data_type, is_nullable
                     FROM information_schema.columns 
-                    WHERE table_name = %s
+                    WHERE table_schema = %s AND table_name = %s
                     AND data_type IN (
                         'integer', 'bigint', 'smallint', 'serial', 'bigserial',
                         'timestamp', 'timestamptz', 'date', 
                         'numeric', 'decimal', 'real', 'double precision'
                     )
                     ORDER BY ordinal_position
-                """, (self.table_name.split('.')[-1],))  # Remove schema prefix if present
+                """, (schema_name or 'public', table_only))
                 
                 columns = cursor.fetchall()
                 
-                for column_name, data_type, is_nullable in columns:
-                    try:
-                        range_info = self._analyze_column_range(cursor, column_name, data_type)
-                        if range_info and self._is_suitable_for_range_chunking(range_info):
-                            rangeable_columns.append(range_info)
-                    except Exception as e:
-                        logger.debug(f"Could not analyze column {column_name}: {e}")
-                        continue
+                for range_info in self._analyze_column_ranges(cursor, columns):
+                    if self._is_suitable_for_range_chunking(range_info):
+                        rangeable_columns.append(range_info)
                 
         except Exception as e:
             logger.warning(f"Error finding rangeable columns for {self.table_name}: {e}")
         
         return rangeable_columns
     
-    def _analyze_column_range(self, cursor, column_name: str, data_type: str) -> Optional[RangeInfo]:
+    def _analyze_column_ranges(self, cursor, columns: List[Tuple[str, str, str]]) -> List[RangeInfo]:
         """
-        Analyze a specific column to determine its range and characteristics
+        Analyze the candidate columns' ranges and characteristics in one table scan
         
         Args:
             cursor: Database cursor
-            column_name: Name of column to analyze
-            data_type: Data type of the column
+            columns: (column_name, data_type, is_nullable) rows from information_schema
             
         Returns:
-            RangeInfo object or None if not suitable
+            RangeInfo objects for the columns that hold at least one value
         """
-        try:
-            # Get min, max, null count, and approximate distinct count
-            cursor.execute("SET statement_timeout = 30000")  # 30 second timeout
-            cursor.execute(f"""
-                SELECT 
-                    MIN({column_name}) as min_val,
-                    MAX({column_name}) as max_val,
-                    COUNT(*) - COUNT({column_name}) as null_count,
-                    COUNT(*) as total_count
-                FROM {self.table_name}
-            """)
-            
-            result = cursor.fetchone()
-            if not result:
-                return None
-            
-            min_val, max_val, null_count, total_count = result
-            
+        if not columns:
+            return []
+        
+        # Min, max and non-null count per column plus one row count, instead of
+        # a separate full scan for every candidate column
+        aggregates = ", ".join(
+            f"MIN({column}), MAX({column}), COUNT({column})"
+            for column in (_quote_identifier(column_name) for column_name, _, _ in columns)
+        )
+        cursor.execute("SET statement_timeout = 30000")  # 30 second timeout
+        cursor.execute(f"SELECT COUNT(*), {aggregates} FROM {self.table_name}")
+        
+        result = cursor.fetchone()
+        if not result:
+            return []
+        
+        total_count = result[0]
+        range_infos = []
+        for i, (column_name, data_type, _) in enumerate(columns):
+            min_val, max_val, non_null_count = result[1 + 3 * i:4 + 3 * i]
             if min_val is None or max_val is None:
-                return None  # No data or all nulls
+                continue  # No data or all nulls
             
             # Check if column appears to be sequential (for numeric types)
             is_sequential = False
             if data_type in ('integer', 'bigint', 'smallint', 'serial', 'bigserial'):
                 is_sequential = self._check_if_sequential(cursor, column_name, min_val, max_val, total_count)
             
-            return RangeInfo(
+            range_infos.append(RangeInfo(
                 column_name=column_name,
                 data_type=data_type,
                 min_value=min_val,
                 max_value=max_val,
                 is_sequential=is_sequential,
-                null_count=null_count
-            )
-            
-        except Exception as e:
-            logger.debug(f"Error analyzing column {column_name}: {e}")
-            return None
+                null_count=total_count - non_null_count
+            ))
+        
+        return range_infos
     
     def _check_if_sequential(self, cursor, column_name: str, min_val: int, max_val: int, total_count: int) -> bool:
         """
@@ -214,10 +210,12 @@ class RangeChunker:
     Handles range-based chunking for large table exports
     """
     
-    def __init__(self, table_name: str, range_info: RangeInfo, job_id: str):
+    def __init__(self, table_name: str, range_info: RangeInfo, job_id: str,
+                 should_cancel: Optional[Callable[[], bool]] = None):
         self.table_name = table_name
         self.range_info = range_info
         self.job_id = job_id
+        self.should_cancel = should_cancel
         self.chunks_created = 0
     
     def calculate_ranges(self, target_chunk_size: int) -> List[Tuple[Any, Any]]:
@@ -259,8 +257,9 @@ class RangeChunker:
                 cursor = db_conn.cursor()
                 # PERFORMANCE OPTIMIZATION: Use shorter timeout for large tables
                 cursor.execute("SET statement_timeout = 60000")  # 60 second timeout (was 30)
-                cursor.execute(f"SELECT COUNT(*) FROM {self.table_name}")
-                actual_row_count = cursor.fetchone()[0]
+                # The ranges span min..max regardless, so the planner estimate is
+                # enough to size them and saves a full table scan
+                actual_row_count = estimate_row_count(cursor, self.table_name)
                 
                 if actual_row_count == 0:
                     return ranges
@@ -302,21 +301,8 @@ class RangeChunker:
                 # PERFORMANCE OPTIMIZATION: Always use simple range division to avoid expensive operations
                 # This prevents hanging on large tables (even with 100M+ rows)
                 total_range = max_val - min_val
-                chunk_range_size = max(1, total_range // optimal_chunk_count)
-                
-                current_start = min_val
-                for i in range(optimal_chunk_count):
-                    if i == optimal_chunk_count - 1:
-                        # Last chunk gets all remaining values
-                        current_end = max_val
-                    else:
-                        current_end = min(current_start + chunk_range_size, max_val)
-                    
-                    ranges.append((current_start, current_end))
-                    current_start = current_end + 1
-                    
-                    if current_start > max_val:
-                        break
+                chunk_range_size = self._range_step(min_val, max_val, optimal_chunk_count)
+                ranges = self._contiguous_ranges(min_val, max_val, chunk_range_size, optimal_chunk_count)
                 
                 logger.info(f"Generated {len(ranges)} ranges for {self.table_name} "
                            f"(avg range size: {chunk_range_size:,}, total range: {total_range:,})")
@@ -324,17 +310,45 @@ class RangeChunker:
         except Exception as e:
             logger.warning(f"Error calculating optimized ranges for {self.table_name}: {e}, using fallback")
             # Fallback to simple approach with performance-oriented defaults
-            estimated_chunks = max(1, min(50, (max_val - min_val) // max(1000000, target_chunk_size)))
-            chunk_range_size = (max_val - min_val) // estimated_chunks if estimated_chunks > 0 else (max_val - min_val)
-            
-            current_start = min_val
-            for i in range(estimated_chunks):
-                current_end = min_val + (i + 1) * chunk_range_size
-                if i == estimated_chunks - 1:
-                    current_end = max_val
-                ranges.append((current_start, current_end))
-                current_start = current_end + 1
+            estimated_chunks = int(max(1, min(50, (max_val - min_val) // max(1000000, target_chunk_size))))
+            chunk_range_size = self._range_step(min_val, max_val, estimated_chunks)
+            ranges = self._contiguous_ranges(min_val, max_val, chunk_range_size, estimated_chunks)
+        
+        return ranges
+    
+    @staticmethod
+    def _range_step(min_val: Any, max_val: Any, count: int) -> Any:
+        """
+        Width of each of `count` ranges over [min_val, max_val]
+        
+        Integer columns step by whole values (at least 1). Float and numeric
+        columns are divided exactly, so a narrow range such as 0.0..1.0 is
+        still split instead of rounding the step down to nothing.
+        """
+        total_range = max_val - min_val
+        if isinstance(total_range, int):
+            return max(1, total_range // count)
+        return total_range / count
+    
+    @staticmethod
+    def _contiguous_ranges(min_val: Any, max_val: Any, step: Any, count: int) -> List[Tuple[Any, Any]]:
+        """
+        Split [min_val, max_val] into up to `count` ranges of width `step`
         
+        Each range ends exactly where the next one starts and the export treats
+        every range but the last as half-open, so values between integer
+        boundaries (numeric, timestamps) are neither skipped nor exported twice.
+        """
+        ranges = []
+        start = min_val
+        for i in range(1, count):
+            end = min_val + i * step
+            if end >= max_val:
+                break
+            if end > start:
+                ranges.append((start, end))
+                start = end
+        ranges.append((start, max_val))
         return ranges
     
     def _calculate_percentile_ranges(self, chunk_count: int) -> List[Tuple[int, int]]:
@@ -344,21 +358,11 @@ class RangeChunker:
     
     def _calculate_simple_numeric_ranges(self, chunk_count: int) -> List[Tuple[int, int]]:
         """Simple fallback range calculation"""
-        ranges = []
         min_val = self.range_info.min_value
         max_val = self.range_info.max_value
         
-        chunk_range_size = (max_val - min_val) // chunk_count
-        
-        current_start = min_val
-        for i in range(chunk_count):
-            current_end = min_val + (i + 1) * chunk_range_size
-            if i == chunk_count - 1:
-                current_end = max_val
-            ranges.append((current_start, current_end))
-            current_start = current_end + 1
-            
-        return ranges
+        chunk_range_size = self._range_step(min_val, max_val, chunk_count)
+        return self._contiguous_ranges(min_val, max_val, chunk_range_size, chunk_count)
     
     def _calculate_time_ranges(self, target_chunk_size: int) -> List[Tuple[str, str]]:
         """Calculate time-based ranges for chunking with optimization"""
@@ -368,10 +372,9 @@ class RangeChunker:
             with get_database_connection() as db_conn:
                 cursor = db_conn.cursor()
                 
-                # Add timeout protection for row count query
+                # Add timeout protection for the fallback row count query
                 cursor.execute("SET statement_timeout = 30000")  # 30 second timeout
-                cursor.execute(f"SELECT COUNT(*) FROM {self.table_name}")
-                total_rows = cursor.fetchone()[0]
+                total_rows = estimate_row_count(cursor, self.table_name)
                 
                 if total_rows == 0:
                     return ranges
@@ -399,39 +402,16 @@ class RangeChunker:
                 min_time = self.range_info.min_value
                 max_time = self.range_info.max_value
                 
-                # Convert timestamps to seconds for calculation
-                if hasattr(min_time, 'timestamp'):
-                    min_seconds = min_time.timestamp()
-                    max_seconds = max_time.timestamp()
-                else:
-                    # Handle string timestamps
+                if isinstance(min_time, str):
                     import datetime
-                    if isinstance(min_time, str):
-                        min_dt = datetime.datetime.fromisoformat(min_time.replace('Z', '+00:00'))
-                        max_dt = datetime.datetime.fromisoformat(max_time.replace('Z', '+00:00'))
-                        min_seconds = min_dt.timestamp()
-                        max_seconds = max_dt.timestamp()
-                    else:
-                        min_seconds = 0
-                        max_seconds = optimal_chunk_count
+                    min_time = datetime.datetime.fromisoformat(min_time.replace('Z', '+00:00'))
+                    max_time = datetime.datetime.fromisoformat(max_time.replace('Z', '+00:00'))
                 
-                # Calculate time intervals
-                total_seconds = max_seconds - min_seconds
-                seconds_per_chunk = total_seconds / optimal_chunk_count
-                
-                for i in range(optimal_chunk_count):
-                    start_seconds = min_seconds + (i * seconds_per_chunk)
-                    end_seconds = min_seconds + ((i + 1) * seconds_per_chunk)
-                    
-                    if i == optimal_chunk_count - 1:
-                        end_seconds = max_seconds  # Last chunk gets everything remaining
-                    
-                    # Convert back to timestamp format
-                    import datetime
-                    start_time = datetime.datetime.fromtimestamp(start_seconds, tz=datetime.timezone.utc)
-                    end_time = datetime.datetime.fromtimestamp(end_seconds, tz=datetime.timezone.utc)
-                    
-                    ranges.append((start_time, end_time))
+                # Step in timedelta arithmetic: exact to the microsecond and keeps the
+                # column's own timezone (or lack of one) instead of round-tripping
+                # through float epoch seconds
+                time_per_chunk = (max_time - min_time) / optimal_chunk_count
+                ranges = self._contiguous_ranges(min_time, max_time, time_per_chunk, optimal_chunk_count)
         
         except Exception as e:
             logger.warning(f"Error calculating time ranges: {e}, falling back to simple approach")
@@ -479,18 +459,28 @@ class RangeChunker:
             # Submit all range export tasks
             future_to_range = {}
             
+            last_chunk = len(ranges) - 1
             for i, (start_val, end_val) in enumerate(ranges):
                 future = executor.submit(
                     self._export_range_chunk,
-                    i, start_val, end_val, output_dir, use_duckdb
+                    i, start_val, end_val, output_dir, use_duckdb, i == last_chunk
                 )
                 future_to_range[future] = (i, start_val, end_val)
             
             # Process completed chunks with enhanced progress reporting
             chunks_completed_since_last_log = 0
             last_progress_log = time.time()
+            cancelled = False
             
             for future in as_completed(future_to_range):
+                # Checked as each chunk finishes: chunks not started yet are dropped,
+                # running ones finish before the pool shuts down
+                if self.should_cancel and self.should_cancel():
+                    cancelled = True
+                    for pending in future_to_range:
+                        pending.cancel()
+                    break
+                
                 chunk_num, start_val, end_val = future_to_range[future]
                 
                 try:
@@ -539,6 +529,11 @@ class RangeChunker:
         elapsed = time.time() - start_time
         throughput = int(total_rows_exported / elapsed) if elapsed > 0 else 0
         
+        if cancelled:
+            logger.info(f"Range-based export of {self.table_name} cancelled after "
+                       f"{successful_chunks}/{len(ranges)} chunks")
+            return False, total_rows_exported
+        
         if failed_chunks == 0:
             total_size_mb = sum(
                 f.stat().st_size for f in output_dir.glob("*.parquet") 
@@ -569,7 +564,7 @@ class RangeChunker:
             return False, 0
     
     def _export_range_chunk(self, chunk_num: int, start_val: Any, end_val: Any, 
-                           output_dir: Path, use_duckdb: bool) -> Tuple[bool, int]:
+                           output_dir: Path, use_duckdb: bool, last: bool = True) -> Tuple[bool, int]:
         """
         Export a single range chunk
         
@@ -579,6 +574,7 @@ class RangeChunker:
             end_val: End value for range
             output_dir: Output directory
             use_duckdb: Whether to use DuckDB export
+            last: Whether this is the final range, the only one that includes end_val
             
         Returns:
             Tuple of (success: bool, rows_exported: int)
@@ -586,13 +582,18 @@ class RangeChunker:
         try:
             chunk_file = output_dir / f"part_{chunk_num:04d}.parquet"
             
-            # Build WHERE clause for range
-            if isinstance(start_val, str) and ('timestamp' in self.range_info.data_type or 'date' in self.range_info.data_type):
-                where_clause = f"{self.range_info.column_name} >= '{start_val}' AND {self.range_info.column_name} <= '{end_val}'"
-            else:
-                where_clause = f"{self.range_info.column_name} >= {start_val} AND {self.range_info.column_name} <= {end_val}"
+            # Ranges share their boundaries, so only the last one includes its end value
+            column = _quote_identifier(self.range_info.column_name)
+            upper = '<=' if last else '<'
             
             if use_duckdb:
+                # DuckDB takes the filter as SQL text; the bounds are the column's own
+                # MIN/MAX-derived values, with dates and timestamps as quoted literals
+                if 'timestamp' in self.range_info.data_type or 'date' in self.range_info.data_type:
+                    where_clause = f"{column} >= '{start_val}' AND {column} {upper} '{end_val}'"
+                else:
+                    where_clause = f"{column} >= {start_val} AND {column} {upper} {end_val}"
+                
                 # Use DuckDB for export with range-based WHERE clause
                 from adu.duckdb_exporter import export_table_chunk_duckdb
                 
@@ -615,19 +616,23 @@ class RangeChunker:
                 return success, rows_exported
             else:
                 # Use direct Polars export (fallback)
-                return self._export_range_with_polars(chunk_file, where_clause)
+                return self._export_range_with_polars(
+                    chunk_file, f"{column} >= %s AND {column} {upper} %s", (start_val, end_val)
+                )
                 
         except Exception as e:
             logger.error(f"Error exporting range chunk {chunk_num}: {str(e)}")
             return False, 0
     
-    def _export_range_with_polars(self, chunk_file: Path, where_clause: str) -> Tuple[bool, int]:
+    def _export_range_with_polars(self, chunk_file: Path, where_clause: str,
+                                  params: Tuple[Any, Any]) -> Tuple[bool, int]:
         """
         Export range using direct Polars (fallback method)
         
         Args:
             chunk_file: Output file path
-            where_clause: WHERE clause for filtering
+            where_clause: WHERE clause for filtering, with %s placeholders
+            params: Range bounds bound to the placeholders
             
         Returns:
             Tuple of (success: bool, rows_exported: int)
@@ -638,7 +643,7 @@ class RangeChunker:
                 
                 # Execute query with range filter
                 query = f"SELECT * FROM {self.table_name} WHERE {where_clause}"
-                cursor.execute(query)
+                cursor.execute(query, params)
                 
                 # Get column names
                 column_names = [desc[0] for desc in cursor.description]
@@ -659,7 +664,8 @@ class RangeChunker:
                 # Write to Parquet
                 df.write_parquet(
                     chunk_file,
-                    compression="snappy",
+                    compression="zstd",
+                    compression_level=1,
                     use_pyarrow=True
                 )
                 
@@ -670,12 +676,18 @@ class RangeChunker:
             return False, 0
 
 
+def _quote_identifier(name: str) -> str:
+    """Double-quote a column name taken from the catalog so its exact case is kept"""
+    return '"' + name.replace('"', '""') + '"'
+
+
 def export_large_table_with_range_chunking(
     job_id: str,
     table_name: str,
     output_dir: Path,
     target_chunk_size: int = 1000000,
-    max_workers: int = 6
+    max_workers: int = 6,
+    should_cancel: Optional[Callable[[], bool]] = None
 ) -> Tuple[bool, int, Optional[RangeInfo]]:
     """
     Export large table using range-based chunking if suitable column found
@@ -686,6 +698,7 @@ def export_large_table_with_range_chunking(
         output_dir: Output directory
         target_chunk_size: Target rows per chunk
         max_workers: Maximum concurrent workers
+        should_cancel: Called between chunks; the export stops once it returns True
         
     Returns:
         Tuple of (success: bool, total_rows_exported: int, range_info_used: RangeInfo)
@@ -706,7 +719,7 @@ def export_large_table_with_range_chunking(
                f"(sequential: {best_column.is_sequential})")
     
     # Create range chunker
-    chunker = RangeChunker(table_name, best_column, job_id)
+    chunker = RangeChunker(table_name, best_column, job_id, should_cancel)
     
     # Calculate ranges
     ranges = chunker.calculate_ranges(target_chunk_size)
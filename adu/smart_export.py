@@ -8,7 +8,7 @@ import time
 import json
 import psutil
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Callable
 from dataclasses import dataclass
 from enum import Enum
 
@@ -167,9 +167,9 @@ class TableAnalyzer:
         """Estimate table size in MB"""
         try:
             # Try to get actual size statistics if available (PostgreSQL/Greenplum)
-            cursor.execute(f"""
-                SELECT pg_total_relation_size('{self.table_name}'::regclass) / 1024.0 / 1024.0
-            """)
+            cursor.execute("""
+                SELECT pg_total_relation_size(%s::regclass) / 1024.0 / 1024.0
+            """, (self.table_name,))
             result = cursor.fetchone()
             if result and result[0]:
                 return float(result[0])
@@ -350,7 +350,7 @@ class SmartExportSelector:
             
             params = {
                 'chunk_size_rows': chunk_size_rows,
-                'compression': 'snappy',
+                'compression': 'zstd',
                 'use_single_file_threshold': 20000000  # Use single file for < 20M rows
             }
         
@@ -371,7 +371,8 @@ def smart_export_table(
     table_name: str,
     output_dir: Path,
     db_type: str,
-    db_config: Optional[Dict[str, Any]] = None
+    db_config: Optional[Dict[str, Any]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None
 ) -> Tuple[bool, int, str]:
     """
     Smart export that automatically selects the best method for the table
@@ -382,6 +383,8 @@ def smart_export_table(
         output_dir: Output directory
         db_type: Database type
         db_config: Database configuration (for DuckDB fallback)
+        should_cancel: Called between chunks by the chunked methods, which stop
+            once it returns True
         
     Returns:
         Tuple of (success: bool, total_rows_exported: int, method_used: str)
@@ -427,21 +430,23 @@ def smart_export_table(
             success, rows_exported, _ = export_large_table_with_range_chunking(
                 job_id, table_name, output_dir,
                 target_chunk_size=params.get('target_chunk_size', 1000000),
-                max_workers=params.get('max_workers', 6)
+                max_workers=params.get('max_workers', 6),
+                should_cancel=should_cancel
             )
         
         elif method == ExportMethod.CURSOR_STREAMING:
             # DuckDB streaming uses connection pool internally, no db_config needed
             success, rows_exported = export_large_table_with_duckdb_streaming(
                 job_id, table_name, output_dir, {},  # Empty db_config - uses connection pool
-                estimated_rows=characteristics.row_count
+                estimated_rows=characteristics.row_count,
+                should_cancel=should_cancel
             )
         
         elif method == ExportMethod.PARALLEL_DUCKDB:
             success, rows_exported = _execute_parallel_duckdb_export(
                 table_name, output_dir, db_config, 
                 characteristics.row_count, params.get('chunk_size', 1000000),
-                params.get('max_workers', 8)
+                params.get('max_workers', 8), should_cancel
             )
         
         else:
@@ -475,6 +480,14 @@ def smart_export_table(
                 file_size_mb=file_size_mb,
                 throughput_rows_per_sec=throughput
             )
+        elif should_cancel and should_cancel():
+            logger.info(f"Smart export of {table_name} stopped after job cancellation")
+            sqlite_writer.table_update(
+                job_id=job_id,
+                table_name=table_name,
+                status='cancelled',
+                error_message="Job cancelled"
+            )
         else:
             logger.error(f"Smart export failed using method: {method.value}")
             
@@ -556,12 +569,14 @@ def _execute_direct_duckdb_export(table_name: str, output_dir: Path,
 def _execute_parallel_duckdb_export(table_name: str, output_dir: Path, 
                                    db_config: Optional[Dict[str, Any]],
                                    row_count: int, chunk_size: int, 
-                                   max_workers: int) -> Tuple[bool, int]:
+                                   max_workers: int,
+                                   should_cancel: Optional[Callable[[], bool]] = None) -> Tuple[bool, int]:
     """Execute parallel DuckDB export (current implementation)"""
     try:
         if db_config:
             success, rows_exported = export_large_table_with_duckdb_parallel(
-                db_config, table_name, output_dir, row_count, chunk_size, max_workers
+                db_config, table_name, output_dir, row_count, chunk_size, max_workers,
+                should_cancel
             )
             
             if success:
@@ -4,16 +4,21 @@ Single SQLite Writer Queue System for ADU Export Application
 Eliminates SQLite file lock contention by serializing all database operations
 """
 
+import hashlib
+import os
 import sqlite3
 import threading
 import queue
 import time
 import json
 import atexit
+import weakref
+from collections import deque
 from typing import Dict, Any, Optional, List, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 from contextlib import contextmanager
+from urllib.parse import quote
 
 from adu.enhanced_logger import logger
 
@@ -34,18 +39,30 @@ class SQLiteOperationType(Enum):
     BATCH = "batch"  # For batch operations
 
 
-@dataclass
+@dataclass(slots=True)
 class SQLiteOperation:
-    """Represents a queued SQLite operation"""
+    """Represents a queued SQLite operation (slotted: one is allocated per write)"""
     operation_type: SQLiteOperationType
     data: Dict[str, Any]
     callback: Optional[Callable] = None
     result_queue: Optional[queue.Queue] = None
-    timestamp: float = None
+    # Operations coalesced into this one; they are settled with its outcome
+    superseded: Optional[List['SQLiteOperation']] = None
+
+
+@dataclass(eq=False)
+class _ReaderState:
+    """Read-only connection owned by one caller thread, with its query count"""
+    connection: sqlite3.Connection
+    queries: int = 0
+
+
+class _ReaderHandle:
+    """Thread-local owner of a _ReaderState; dropped (and finalized) when its thread exits"""
+    __slots__ = ('state', '__weakref__')
     
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = time.time()
+    def __init__(self, state: _ReaderState):
+        self.state = state
 
 
 class SQLiteWriterQueue:
@@ -54,18 +71,48 @@ class SQLiteWriterQueue:
     Eliminates lock contention and improves performance through batching.
     """
     
+    # Bound the argument marshalling done by a single executemany call
+    ERROR_LOG_CHUNK_SIZE = 500
+    # Retry a batch that failed on a locking/IO error this many times before dropping it
+    MAX_FLUSH_RETRIES = 3
+    # Primary result codes that affect the whole transaction and are worth retrying; any
+    # other OperationalError (no such column, syntax) is the fault of the one operation
+    TRANSIENT_SQLITE_ERRORS = frozenset({sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED, sqlite3.SQLITE_IOERR})
+    # Operations per transaction when draining the queue on shutdown
+    SHUTDOWN_FLUSH_CHUNK = 10000
+    # Seconds between PASSIVE WAL checkpoints run by the writer thread
+    CHECKPOINT_INTERVAL = 60.0
+    # DATETIME columns that job_update()/table_update() accept as epoch seconds
+    TIMESTAMP_FIELDS = frozenset({'start_time', 'end_time', 'estimated_completion'})
+    # Last-writer-wins job columns that job_update() buffers instead of queueing
+    PROGRESS_FIELDS = frozenset({'rows_processed', 'progress_percent', 'throughput_rows_per_sec'})
+    
     def __init__(self, db_path: str, batch_size: int = 50, batch_timeout: float = 5.0):
         self.db_path = db_path
         self.batch_size = batch_size
         self.batch_timeout = batch_timeout
         
-        self._queue = queue.Queue()
+        self._queue = deque()
+        self._queue_cv = threading.Condition()
         self._shutdown_event = threading.Event()
         self._worker_thread = None
         self._connection = None
         self._cursor = None
+        # Reads bypass the writer thread on per-thread read-only connections (WAL allows
+        # concurrent readers); an in-memory database is only visible to the writer
+        self._direct_reads = db_path != ':memory:'
+        self._reader_tls = threading.local()
+        self._reader_states = set()
+        self._retired_reader_queries = 0
+        self._reader_lock = threading.Lock()
         self._batch_operations = []
+        # Pending progress columns per job_id, written back at the next batch flush
+        self._progress_state = {}
+        # Producers merge into and pop from the buffer from several threads at once
+        self._progress_lock = threading.Lock()
         self._last_batch_time = time.time()
+        self._last_checkpoint_time = time.time()
+        self._flush_failures = 0
         self._stats = {
             'operations_processed': 0,
             'batch_operations': 0,
@@ -74,6 +121,20 @@ class SQLiteWriterQueue:
             'total_queries': 0
         }
         
+        # Write handlers per operation type; QUERY is served by _process_query_operation
+        self._dispatch = {
+            SQLiteOperationType.JOB_START: self._op_job_start,
+            SQLiteOperationType.JOB_UPDATE: self._op_job_update,
+            SQLiteOperationType.JOB_COMPLETE: self._op_job_complete,
+            SQLiteOperationType.JOB_FAIL: self._op_job_fail,
+            SQLiteOperationType.TABLE_START: self._op_table_start,
+            SQLiteOperationType.TABLE_UPDATE: self._op_table_update,
+            SQLiteOperationType.TABLE_COMPLETE: self._op_table_complete,
+            SQLiteOperationType.TABLE_FAIL: self._op_table_fail,
+            SQLiteOperationType.BATCH: self._op_batch,
+            SQLiteOperationType.ERROR_LOG: self._op_error_log,
+        }
+        
         # Initialize database and start worker thread
         self._init_database()
         self._start_worker()
@@ -88,11 +149,18 @@ class SQLiteWriterQueue:
             self._connection.row_factory = sqlite3.Row
             self._cursor = self._connection.cursor()
             
+            # Larger pages on a fresh database; must be set before switching to WAL
+            self._cursor.execute("PRAGMA page_size=8192")
+            
             # Enable WAL mode for better concurrency
             self._cursor.execute("PRAGMA journal_mode=WAL")
             self._cursor.execute("PRAGMA synchronous=NORMAL")
-            self._cursor.execute("PRAGMA cache_size=10000")
+            self._cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
             self._cursor.execute("PRAGMA temp_store=MEMORY")
+            self._cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+            # The writer batches commits, so checkpoint less eagerly than the 1000-page default
+            self._cursor.execute("PRAGMA wal_autocheckpoint=10000")
+            self._cursor.execute("PRAGMA busy_timeout=5000")
             
             self._create_tables()
             logger.info("SQLite writer initialized with WAL mode enabled")
@@ -131,6 +199,7 @@ class SQLiteWriterQueue:
                 error_message TEXT,
                 traceback TEXT,
                 context TEXT,
+                traceback_hash TEXT,
                 FOREIGN KEY (job_id) REFERENCES jobs (job_id)
             )''',
             
@@ -158,14 +227,77 @@ class SQLiteWriterQueue:
                 validation_status TEXT DEFAULT 'pending',
                 checksum TEXT,
                 FOREIGN KEY (job_id) REFERENCES jobs (job_id)
+            )''',
+            
+            # Each distinct traceback once; errors reference it by traceback_hash
+            '''CREATE TABLE IF NOT EXISTS tracebacks (
+                traceback_hash TEXT PRIMARY KEY,
+                traceback TEXT
             )'''
         ]
         
         for table_sql in tables:
             self._cursor.execute(table_sql)
         
+        # Databases created before traceback deduplication lack the hash column
+        self._cursor.execute("PRAGMA table_info(errors)")
+        if 'traceback_hash' not in {row[1] for row in self._cursor.fetchall()}:
+            self._cursor.execute("ALTER TABLE errors ADD COLUMN traceback_hash TEXT")
+        
+        self._create_indexes()
         self._connection.commit()
     
+    def _create_indexes(self):
+        """Create lookup indexes for the per-job UPDATE and SELECT paths"""
+        self._cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_table_exports_job_table'"
+        )
+        if self._cursor.fetchone() is None:
+            # The unique index does not exist yet, so this runs once per database
+            self._migrate_table_export_attempts()
+        
+        indexes = [
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_table_exports_job_table ON table_exports (job_id, table_name)",
+            "CREATE INDEX IF NOT EXISTS idx_errors_job_id ON errors (job_id, timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_overall_status ON jobs (overall_status)"
+        ]
+        
+        for index_sql in indexes:
+            self._cursor.execute(index_sql)
+    
+    def _migrate_table_export_attempts(self):
+        """
+        One-time migration to one table_exports row per (job_id, table_name)
+        
+        Older databases hold one row per attempt, which the unique index used by
+        TABLE_START's upsert rejects. Superseded attempts are moved to
+        table_exports_history rather than discarded, and counted into the
+        retry_count of the latest attempt that stays.
+        """
+        superseded = """SELECT id FROM table_exports WHERE id NOT IN
+                        (SELECT MAX(id) FROM table_exports GROUP BY job_id, table_name)"""
+        self._cursor.execute(f"SELECT COUNT(*) FROM ({superseded})")
+        count = self._cursor.fetchone()[0]
+        if not count:
+            return
+        
+        logger.warning(f"Migrating table_exports: moving {count} superseded attempt rows "
+                       f"to table_exports_history")
+        self._cursor.execute("CREATE TABLE IF NOT EXISTS table_exports_history AS "
+                             "SELECT * FROM table_exports WHERE 0")
+        self._cursor.execute(f"INSERT INTO table_exports_history SELECT * FROM table_exports "
+                             f"WHERE id IN ({superseded})")
+        self._cursor.execute(
+            """UPDATE table_exports SET retry_count = COALESCE(retry_count, 0) +
+                   (SELECT COUNT(*) - 1 FROM table_exports AS attempt
+                    WHERE attempt.job_id IS table_exports.job_id
+                      AND attempt.table_name IS table_exports.table_name)
+               WHERE id IN (SELECT MAX(id) FROM table_exports GROUP BY job_id, table_name
+                            HAVING COUNT(*) > 1)"""
+        )
+        self._cursor.execute(f"DELETE FROM table_exports WHERE id IN ({superseded})")
+        logger.info(f"Migrated table_exports: {count} superseded attempt rows kept in table_exports_history")
+    
     def _start_worker(self):
         """Start the background worker thread"""
         self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
@@ -178,13 +310,8 @@ class SQLiteWriterQueue:
         
         while not self._shutdown_event.is_set():
             try:
-                # Process operations with timeout
+                # Wait for work, drain the queue and flush on size or timeout
                 self._process_operations()
-                
-                # Handle batching timeout
-                if (time.time() - self._last_batch_time > self.batch_timeout and 
-                    self._batch_operations):
-                    self._flush_batch()
                     
             except Exception as e:
                 logger.error(f"Error in SQLite worker loop: {e}")
@@ -194,50 +321,103 @@ class SQLiteWriterQueue:
         self._flush_remaining_operations()
         logger.info("SQLite writer worker loop stopped")
     
+    def _enqueue(self, operation: SQLiteOperation):
+        """Append an operation to the queue and wake the worker"""
+        # deque.append is atomic under the GIL; the condition only guards the wakeup
+        self._queue.append(operation)
+        with self._queue_cv:
+            self._queue_cv.notify()
+    
     def _process_operations(self):
-        """Process queued operations, batching when possible"""
+        """Wait for queued operations, then drain everything available in one pass"""
+        # With a partial batch pending, wake no later than its flush deadline
+        timeout = self.batch_timeout
+        if self._batch_operations or self._progress_state:
+            timeout = max(0.0, self._last_batch_time + self.batch_timeout - time.time())
+        
+        with self._queue_cv:
+            self._queue_cv.wait_for(
+                lambda: self._queue or self._shutdown_event.is_set(),
+                timeout=timeout
+            )
+        
+        # Update queue size stats once per wake rather than per operation
+        current_queue_size = len(self._queue)
+        if current_queue_size > self._stats['queue_size_max']:
+            self._stats['queue_size_max'] = current_queue_size
+        
+        processed = 0
+        while True:
+            try:
+                operation = self._queue.popleft()
+            except IndexError:
+                break
+            
+            processed += 1
+            self._route_operation(operation)
+        
+        self._stats['operations_processed'] += processed
+        
+        # Handle batching timeout
+        if ((self._batch_operations or self._progress_state) and
+                time.time() - self._last_batch_time >= self.batch_timeout):
+            self._flush_batch()
+        
+        if time.time() - self._last_checkpoint_time >= self.CHECKPOINT_INTERVAL:
+            self._checkpoint_wal()
+    
+    def _checkpoint_wal(self):
+        """Copy committed WAL frames back into the database without blocking readers
+        
+        wal_autocheckpoint only fires on commit once the WAL is large; a periodic
+        PASSIVE checkpoint keeps it small between bursts of job updates.
+        """
+        self._last_checkpoint_time = time.time()
         try:
-            # Get operation with timeout
-            operation = self._queue.get(timeout=1.0)
-            self._stats['operations_processed'] += 1
-            
-            # Update queue size stats
-            current_queue_size = self._queue.qsize()
-            self._stats['queue_size_max'] = max(self._stats['queue_size_max'], current_queue_size)
-            
-            # Handle different operation types
-            if operation.operation_type == SQLiteOperationType.BATCH:
-                self._process_batch_operation(operation)
-            elif operation.operation_type == SQLiteOperationType.QUERY:
-                self._process_query_operation(operation)
-            else:
-                # Add to batch for regular operations
-                self._batch_operations.append(operation)
-                
-                # Flush batch if it's full
-                if len(self._batch_operations) >= self.batch_size:
-                    self._flush_batch()
-                    
-            self._queue.task_done()
+            self._connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            logger.warning(f"Periodic WAL checkpoint failed: {e}")
+    
+    def _route_operation(self, operation: SQLiteOperation):
+        """Hand a dequeued operation to its handler, batching regular writes"""
+        if operation.operation_type == SQLiteOperationType.BATCH:
+            self._process_batch_operation(operation)
+        elif operation.operation_type == SQLiteOperationType.QUERY:
+            self._process_query_operation(operation)
+        else:
+            # Add to batch for regular operations
+            self._batch_operations.append(operation)
             
-        except queue.Empty:
-            # No operations to process
-            pass
+            # Flush batch if it's full
+            if len(self._batch_operations) >= self.batch_size:
+                self._flush_batch()
     
     def _process_batch_operation(self, operation: SQLiteOperation):
-        """Process a batch operation immediately"""
+        """Process a batch operation immediately as a single atomic transaction"""
+        sub_operations = operation.data['operations']
+        
+        # Keep ordering with operations queued before this batch; if they were requeued
+        # after a failed flush, run the batch again once they have been retried
+        requeued = self._flush_batch()
+        if requeued:
+            self._queue.insert(requeued, operation)
+            return
+        
         try:
+            self._connection.execute("BEGIN IMMEDIATE")
             self._execute_operation(operation)
             self._connection.commit()
             self._stats['batch_operations'] += 1
             
-            if operation.callback:
-                operation.callback()
-                
         except Exception as e:
             logger.error(f"Error processing batch operation: {e}")
-            if operation.result_queue:
-                operation.result_queue.put(('error', str(e)))
+            self._rollback()
+            self._fail_operations(sub_operations + [operation], e)
+            return
+        
+        for sub_operation in sub_operations:
+            self._notify_success(sub_operation)
+        self._notify_success(operation)
     
     def _process_query_operation(self, operation: SQLiteOperation):
         """Process a SELECT query operation"""
@@ -256,151 +436,457 @@ class SQLiteWriterQueue:
             if operation.result_queue:
                 operation.result_queue.put(('error', str(e)))
     
-    def _flush_batch(self):
-        """Flush accumulated batch operations"""
-        if not self._batch_operations:
-            return
+    def _flush_batch(self) -> int:
+        """Flush accumulated batch operations, returning how many were requeued for retry"""
+        if not self._batch_operations and not self._progress_state:
+            return 0
+        
+        # Hand the accumulated batch off and start a fresh one before doing any work
+        pending, self._batch_operations = self._batch_operations, []
+        operations = self._coalesce_batch(pending)
+        progress_operations = self._take_progress_operations()
+        applied = []
+        # Row-level failures are reported only once the transaction settles, so a waiter
+        # is never told its write failed and then sees it applied by a requeued retry
+        rejected = []
         
         try:
             self._connection.execute("BEGIN")
             
-            for operation in self._batch_operations:
+            error_log_operations = []
+            for operation in operations:
+                # Error log rows are independent of the other tables; insert them in bulk below
+                if operation.operation_type == SQLiteOperationType.ERROR_LOG:
+                    error_log_operations.append(operation)
+                    continue
+                
                 try:
                     self._execute_operation(operation)
+                except sqlite3.OperationalError as e:
+                    if self._is_transient(e):
+                        # Locking/IO problems affect the whole transaction, not just this row
+                        raise
+                    logger.error(f"Error in batch operation {operation.operation_type}: {e}")
+                    rejected.append((operation, e))
+                    continue
                 except Exception as e:
+                    # Bad data for this row (constraint violation, missing field); the rest are fine
                     logger.error(f"Error in batch operation {operation.operation_type}: {e}")
-                    if operation.result_queue:
-                        operation.result_queue.put(('error', str(e)))
+                    rejected.append((operation, e))
                     continue
                 
-                # Handle callbacks and result queues
-                if operation.result_queue:
-                    operation.result_queue.put(('success', None))
-                if operation.callback:
-                    operation.callback()
+                applied.append(operation)
+            
+            if error_log_operations:
+                applied.extend(self._insert_error_logs(error_log_operations, rejected))
+            
+            # Buffered progress is newer than anything queued for the same job, so it goes last
+            if progress_operations:
+                self._execute_progress_updates(progress_operations)
             
             self._connection.commit()
-            logger.debug(f"Flushed batch of {len(self._batch_operations)} operations")
+            logger.debug(f"Flushed batch of {len(pending)} operations "
+                         f"({len(operations)} after coalescing)")
             
-            self._batch_operations.clear()
             self._last_batch_time = time.time()
             self._stats['batch_operations'] += 1
+            self._flush_failures = 0
+            
+        except sqlite3.OperationalError as e:
+            self._rollback()
+            if not self._is_transient(e):
+                logger.error(f"Error flushing batch operations: {e}")
+                self._fail_operations(operations, e)
+                return 0
+            self._flush_failures += 1
+            if self._flush_failures <= self.MAX_FLUSH_RETRIES:
+                # Requeue ahead of newer operations so ordering is preserved on retry
+                logger.warning(f"Batch flush failed ({e}), requeueing {len(operations)} operations "
+                               f"(attempt {self._flush_failures}/{self.MAX_FLUSH_RETRIES})")
+                requeued = operations + progress_operations
+                self._queue.extendleft(reversed(requeued))
+                return len(requeued)
+            logger.error(f"Error flushing batch operations, dropping {len(operations)} operations: {e}")
+            self._flush_failures = 0
+            self._fail_operations(operations, e)
+            return 0
             
         except Exception as e:
             logger.error(f"Error flushing batch operations: {e}")
-            try:
-                self._connection.rollback()
-            except:
-                pass
-            self._batch_operations.clear()
+            self._rollback()
+            self._fail_operations(operations, e)
+            return 0
+        
+        # Handle callbacks and result queues once the writes are durable
+        for operation in applied:
+            self._notify_success(operation)
+        for operation, error in rejected:
+            self._fail_operations([operation], error)
+        return 0
     
-    def _execute_operation(self, operation: SQLiteOperation):
-        """Execute a single SQLite operation"""
-        op_type = operation.operation_type
-        data = operation.data
-        
-        if op_type == SQLiteOperationType.JOB_START:
-            # Check if job already exists and is completed
-            self._cursor.execute("SELECT status, overall_status FROM jobs WHERE job_id = ?", (data['job_id'],))
-            existing_job = self._cursor.fetchone()
-            
-            if existing_job and existing_job[1] in ('completed', 'completed_with_errors'):
-                # Job is already completed, don't overwrite
-                return
-            elif existing_job:
-                # Job exists but not completed, update only non-completion fields
-                self._cursor.execute(
-                    """UPDATE jobs SET db_username = ?, celery_task_id = ?, start_time = ?, tables_total = ?
-                       WHERE job_id = ? AND overall_status NOT IN ('completed', 'completed_with_errors')""",
-                    (data.get('db_username'), data.get('celery_task_id'), data['start_time'], 
-                     data.get('tables_total', 0), data['job_id'])
-                )
-            else:
-                # New job, insert normally
-                self._cursor.execute(
-                    """INSERT INTO jobs 
-                       (job_id, db_username, status, overall_status, celery_task_id, start_time, tables_total) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (data['job_id'], data.get('db_username'), data['status'], data['status'],
-                     data.get('celery_task_id'), data['start_time'], data.get('tables_total', 0))
-                )
+    def _take_progress_operations(self) -> List[SQLiteOperation]:
+        """Drain buffered progress into JOB_UPDATE operations"""
+        with self._progress_lock:
+            pending, self._progress_state = self._progress_state, {}
         
-        elif op_type == SQLiteOperationType.JOB_UPDATE:
-            # Build dynamic UPDATE query based on provided fields
-            fields = []
-            values = []
-            for field, value in data.items():
-                if field != 'job_id':
-                    fields.append(f"{field} = ?")
-                    values.append(value)
-            
-            if fields:
-                values.append(data['job_id'])
-                self._cursor.execute(
-                    f"UPDATE jobs SET {', '.join(fields)} WHERE job_id = ?",
-                    values
-                )
+        operations = []
+        for job_id, progress in pending.items():
+            data = {'job_id': job_id}
+            data.update(progress)
+            operations.append(SQLiteOperation(operation_type=SQLiteOperationType.JOB_UPDATE, data=data))
+        return operations
+    
+    def _execute_progress_updates(self, operations: List[SQLiteOperation]):
+        """Write buffered progress with one executemany per distinct column set"""
+        groups = {}
+        for operation in operations:
+            fields = tuple(sorted(field for field in operation.data if field != 'job_id'))
+            groups.setdefault(fields, []).append(operation.data)
         
-        elif op_type == SQLiteOperationType.JOB_COMPLETE:
-            self._cursor.execute(
-                "UPDATE jobs SET status = ?, overall_status = ?, end_time = ? WHERE job_id = ?",
-                ('completed', 'completed', data['end_time'], data['job_id'])
+        for fields, rows in groups.items():
+            self._cursor.executemany(
+                f"UPDATE jobs SET {', '.join(f'{field} = ?' for field in fields)} WHERE job_id = ?",
+                [[row[field] for field in fields] + [row['job_id']] for row in rows]
             )
+    
+    @classmethod
+    def _is_transient(cls, error: sqlite3.OperationalError) -> bool:
+        """Whether an OperationalError is lock contention or I/O trouble rather than a bad statement"""
+        code = getattr(error, 'sqlite_errorcode', None)
+        if code is None:
+            message = str(error).lower()
+            return 'locked' in message or 'busy' in message or 'disk i/o' in message
+        # Extended result codes carry the primary code in the low byte
+        return (code & 0xff) in cls.TRANSIENT_SQLITE_ERRORS
+    
+    def _rollback(self):
+        """Roll back the current transaction, ignoring errors"""
+        try:
+            self._connection.rollback()
+        except sqlite3.Error:
+            pass
+    
+    def _fail_operations(self, operations: List[SQLiteOperation], error: Exception):
+        """Signal waiters that their operations (and any merged into them) were not applied"""
+        for operation in operations:
+            if operation.result_queue:
+                operation.result_queue.put(('error', str(error)))
+            if operation.superseded:
+                self._fail_operations(operation.superseded, error)
+    
+    def _insert_error_logs(self, operations: List[SQLiteOperation],
+                           rejected: List[tuple]) -> List[SQLiteOperation]:
+        """Insert ERROR_LOG operations with executemany in bounded chunks, returning those applied
         
-        elif op_type == SQLiteOperationType.JOB_FAIL:
-            self._cursor.execute(
-                "UPDATE jobs SET status = ?, overall_status = ?, end_time = ?, error_message = ? WHERE job_id = ?",
-                ('failed', 'failed', data['end_time'], data['error_message'], data['job_id'])
-            )
+        Chunks that fail on bad data are added to rejected as (operation, error) pairs.
+        """
+        applied = []
+        for start in range(0, len(operations), self.ERROR_LOG_CHUNK_SIZE):
+            chunk = operations[start:start + self.ERROR_LOG_CHUNK_SIZE]
+            tracebacks = {op.data['traceback_hash']: op.data['traceback']
+                          for op in chunk if op.data.get('traceback_hash')}
+            rows = [self._error_row(op.data) for op in chunk]
+            
+            try:
+                if tracebacks:
+                    self._cursor.executemany(
+                        "INSERT OR IGNORE INTO tracebacks (traceback_hash, traceback) VALUES (?, ?)",
+                        tracebacks.items()
+                    )
+                self._cursor.executemany(
+                    "INSERT INTO errors (job_id, timestamp, error_message, traceback, traceback_hash, context) "
+                    "VALUES (?, datetime(?, 'unixepoch', 'localtime'), ?, ?, ?, ?)",
+                    rows
+                )
+            except sqlite3.OperationalError as e:
+                if self._is_transient(e):
+                    raise
+                logger.error(f"Error inserting {len(chunk)} error log entries: {e}")
+                rejected.extend((operation, e) for operation in chunk)
+                continue
+            except Exception as e:
+                logger.error(f"Error inserting {len(chunk)} error log entries: {e}")
+                rejected.extend((operation, e) for operation in chunk)
+                continue
+            
+            applied.extend(chunk)
         
-        elif op_type == SQLiteOperationType.TABLE_START:
-            self._cursor.execute(
-                """INSERT OR REPLACE INTO table_exports 
-                   (job_id, table_name, status, start_time, row_count) 
-                   VALUES (?, ?, ?, ?, ?)""",
-                (data['job_id'], data['table_name'], data['status'], 
-                 data['start_time'], data.get('row_count', 0))
-            )
+        return applied
+    
+    def _coalesce_batch(self, operations: List[SQLiteOperation]) -> List[SQLiteOperation]:
+        """
+        Collapse repeated JOB_UPDATE / TABLE_UPDATE operations for the same key.
         
-        elif op_type == SQLiteOperationType.TABLE_UPDATE:
-            # Dynamic update for table exports
-            fields = []
-            values = []
-            for field, value in data.items():
-                if field not in ['job_id', 'table_name']:
-                    fields.append(f"{field} = ?")
-                    values.append(value)
-            
-            if fields:
-                values.extend([data['job_id'], data['table_name']])
-                self._cursor.execute(
-                    f"UPDATE table_exports SET {', '.join(fields)} WHERE job_id = ? AND table_name = ?",
-                    values
-                )
+        Later updates are merged into the first pending update for that key
+        (last writer wins per column). Any other operation on the same job or
+        table acts as a barrier so updates are never reordered around it.
+        A table completion or failure that directly follows its start in the
+        same batch is folded into the start, so short tables take one write.
+        Waiters on superseded operations are notified with the outcome of the
+        operation they were merged into, once it has been committed or failed.
+        """
+        coalesced = []
+        last_job_update = {}
+        last_table_update = {}
+        pending_table_start = {}
         
-        elif op_type == SQLiteOperationType.TABLE_COMPLETE:
-            self._cursor.execute(
-                """UPDATE table_exports 
-                   SET status = ?, end_time = ?, rows_processed = ?, file_path = ?, 
-                       file_size_mb = ?, throughput_rows_per_sec = ?
-                   WHERE job_id = ? AND table_name = ?""",
-                ('completed', data['end_time'], data.get('rows_processed', 0),
-                 data.get('file_path'), data.get('file_size_mb', 0), 
-                 data.get('throughput_rows_per_sec', 0), data['job_id'], data['table_name'])
-            )
+        for operation in operations:
+            op_type = operation.operation_type
+            data = operation.data
+            
+            if op_type == SQLiteOperationType.JOB_UPDATE:
+                existing = last_job_update.get(data.get('job_id'))
+                if existing is not None:
+                    existing.data.update(data)
+                    self._supersede(existing, operation)
+                    continue
+                last_job_update[data.get('job_id')] = operation
+            
+            elif op_type == SQLiteOperationType.TABLE_UPDATE:
+                key = (data.get('job_id'), data.get('table_name'))
+                pending_table_start.pop(key, None)
+                existing = last_table_update.get(key)
+                if existing is not None:
+                    existing.data.update(data)
+                    self._supersede(existing, operation)
+                    continue
+                last_table_update[key] = operation
+            
+            elif op_type in (SQLiteOperationType.JOB_START, SQLiteOperationType.JOB_COMPLETE,
+                             SQLiteOperationType.JOB_FAIL):
+                last_job_update.pop(data.get('job_id'), None)
+            
+            elif op_type == SQLiteOperationType.TABLE_START:
+                key = (data.get('job_id'), data.get('table_name'))
+                last_table_update.pop(key, None)
+                pending_table_start[key] = operation
+            
+            elif op_type in (SQLiteOperationType.TABLE_COMPLETE, SQLiteOperationType.TABLE_FAIL):
+                key = (data.get('job_id'), data.get('table_name'))
+                last_table_update.pop(key, None)
+                start = pending_table_start.pop(key, None)
+                if start is not None:
+                    start.data.update((field, value) for field, value in data.items()
+                                      if field not in ('job_id', 'table_name'))
+                    start.data['status'] = ('completed' if op_type == SQLiteOperationType.TABLE_COMPLETE
+                                            else 'failed')
+                    self._supersede(start, operation)
+                    continue
+            
+            coalesced.append(operation)
+        
+        return coalesced
+    
+    @staticmethod
+    def _supersede(survivor: SQLiteOperation, operation: SQLiteOperation):
+        """Record that operation was merged into survivor and shares its outcome"""
+        if survivor.superseded is None:
+            survivor.superseded = []
+        survivor.superseded.append(operation)
+    
+    def _notify_success(self, operation: SQLiteOperation):
+        """Signal waiters that an operation (and any merged into it) has been applied"""
+        if operation.result_queue:
+            operation.result_queue.put(('success', None))
+        if operation.callback:
+            operation.callback()
+        for merged in operation.superseded or ():
+            self._notify_success(merged)
+    
+    def _execute_operation(self, operation: SQLiteOperation):
+        """Execute a single SQLite operation"""
+        handler = self._dispatch.get(operation.operation_type)
+        if handler is not None:
+            handler(operation.data)
+    
+    def _op_job_start(self, data: Dict[str, Any]):
+        """Insert or restart a job row"""
+        # Insert a new job, or refresh a restarted one's metadata; completed and cancelled
+        # jobs are never touched, and status is never rewritten by the upsert
+        self._cursor.execute(
+            """INSERT INTO jobs 
+               (job_id, db_username, status, overall_status, celery_task_id, start_time, tables_total) 
+               VALUES (?, ?, ?, ?, ?, datetime(?, 'unixepoch', 'localtime'), ?)
+               ON CONFLICT(job_id) DO UPDATE SET
+                   db_username = excluded.db_username,
+                   celery_task_id = COALESCE(excluded.celery_task_id, jobs.celery_task_id),
+                   start_time = excluded.start_time,
+                   tables_total = excluded.tables_total
+               WHERE jobs.overall_status NOT IN ('completed', 'completed_with_errors', 'cancelled')
+                 AND jobs.status IS NOT 'cancelled'""",
+            (data['job_id'], data.get('db_username'), data['status'], data['status'],
+             data.get('celery_task_id'), data['start_time'],
+             data.get('tables_total', 0))
+        )
+        # A job queued by the web app moves to running; a cancel that landed before this
+        # start write is kept
+        self._cursor.execute(
+            "UPDATE jobs SET status = ?, overall_status = ? WHERE job_id = ? AND status = 'queued'",
+            (data['status'], data['status'], data['job_id'])
+        )
+    
+    def _assignment(self, field: str, value: Any) -> str:
+        """SET clause for one column; epoch timestamps are converted to DATETIME text by SQLite"""
+        if field in self.TIMESTAMP_FIELDS and isinstance(value, (int, float)):
+            return f"{field} = datetime(?, 'unixepoch', 'localtime')"
+        return f"{field} = ?"
+    
+    def _op_job_update(self, data: Dict[str, Any]):
+        """Apply a partial update to a job row"""
+        # Build dynamic UPDATE query based on provided fields
+        fields = []
+        values = []
+        for field, value in data.items():
+            if field != 'job_id':
+                fields.append(self._assignment(field, value))
+                values.append(value)
         
-        elif op_type == SQLiteOperationType.TABLE_FAIL:
+        if fields:
+            values.append(data['job_id'])
             self._cursor.execute(
-                "UPDATE table_exports SET status = ?, end_time = ?, error_message = ? WHERE job_id = ? AND table_name = ?",
-                ('failed', data['end_time'], data['error_message'], data['job_id'], data['table_name'])
+                f"UPDATE jobs SET {', '.join(fields)} WHERE job_id = ?",
+                values
             )
+    
+    def _op_job_complete(self, data: Dict[str, Any]):
+        """Mark a job completed"""
+        self._cursor.execute(
+            "UPDATE jobs SET status = ?, overall_status = ?, end_time = datetime(?, 'unixepoch', 'localtime') WHERE job_id = ?",
+            ('completed', 'completed', data['end_time'], data['job_id'])
+        )
+    
+    def _op_job_fail(self, data: Dict[str, Any]):
+        """Mark a job failed"""
+        self._cursor.execute(
+            "UPDATE jobs SET status = ?, overall_status = ?, end_time = datetime(?, 'unixepoch', 'localtime'), error_message = ? "
+            "WHERE job_id = ?",
+            ('failed', 'failed', data['end_time'], data['error_message'], data['job_id'])
+        )
+    
+    def _op_table_start(self, data: Dict[str, Any]):
+        """Insert or restart a table export row
+        
+        A start that was merged with its completion or failure in the same
+        batch carries the final state and is written in this one statement.
+        """
+        # A restarted table keeps its row (and file/validation details) and counts the retry
+        self._cursor.execute(
+            """INSERT INTO table_exports 
+               (job_id, table_name, status, start_time, row_count, end_time, rows_processed,
+                file_path, file_size_mb, throughput_rows_per_sec, error_message) 
+               VALUES (?, ?, ?, datetime(?, 'unixepoch', 'localtime'), ?,
+                       datetime(?, 'unixepoch', 'localtime'), ?, ?, ?, ?, ?)
+               ON CONFLICT(job_id, table_name) DO UPDATE SET
+                   status = excluded.status,
+                   start_time = excluded.start_time,
+                   row_count = excluded.row_count,
+                   rows_processed = excluded.rows_processed,
+                   end_time = excluded.end_time,
+                   error_message = excluded.error_message,
+                   file_path = CASE WHEN excluded.status = 'completed'
+                                    THEN excluded.file_path ELSE table_exports.file_path END,
+                   file_size_mb = CASE WHEN excluded.status = 'completed'
+                                       THEN excluded.file_size_mb ELSE table_exports.file_size_mb END,
+                   throughput_rows_per_sec = CASE WHEN excluded.status = 'completed'
+                                                  THEN excluded.throughput_rows_per_sec
+                                                  ELSE table_exports.throughput_rows_per_sec END,
+                   retry_count = table_exports.retry_count + 1""",
+            (data['job_id'], data['table_name'], data['status'], 
+             data['start_time'], data.get('row_count', 0), data.get('end_time'),
+             data.get('rows_processed', 0), data.get('file_path'), data.get('file_size_mb', 0),
+             data.get('throughput_rows_per_sec', 0), data.get('error_message'))
+        )
+    
+    def _table_update_statement(self, data: Dict[str, Any]):
+        """Build the (sql, values) for a partial table export update, or None if nothing to set"""
+        fields = []
+        values = []
+        for field, value in data.items():
+            if field != 'job_id' and field != 'table_name':
+                fields.append(self._assignment(field, value))
+                values.append(value)
+        
+        if not fields:
+            return None
+        values.append(data['job_id'])
+        values.append(data['table_name'])
+        return f"UPDATE table_exports SET {', '.join(fields)} WHERE job_id = ? AND table_name = ?", values
+    
+    def _op_table_update(self, data: Dict[str, Any]):
+        """Apply a partial update to a table export row"""
+        statement = self._table_update_statement(data)
+        if statement:
+            self._cursor.execute(*statement)
+    
+    def _op_table_complete(self, data: Dict[str, Any]):
+        """Mark a table export completed"""
+        self._cursor.execute(
+            """UPDATE table_exports 
+               SET status = ?, end_time = datetime(?, 'unixepoch', 'localtime'), rows_processed = ?, file_path = ?, 
+                   file_size_mb = ?, throughput_rows_per_sec = ?
+               WHERE job_id = ? AND table_name = ?""",
+            ('completed', data['end_time'], data.get('rows_processed', 0),
+             data.get('file_path'), data.get('file_size_mb', 0), 
+             data.get('throughput_rows_per_sec', 0), data['job_id'], data['table_name'])
+        )
+    
+    def _op_table_fail(self, data: Dict[str, Any]):
+        """Mark a table export failed"""
+        self._cursor.execute(
+            "UPDATE table_exports SET status = ?, end_time = datetime(?, 'unixepoch', 'localtime'), error_message = ? "
+            "WHERE job_id = ? AND table_name = ?",
+            ('failed', data['end_time'], data['error_message'], data['job_id'], data['table_name'])
+        )
+    
+    def _op_batch(self, data: Dict[str, Any]):
+        """Execute the operations collected by batch_context()
         
-        elif op_type == SQLiteOperationType.ERROR_LOG:
+        Consecutive table updates that produce the same statement (e.g. the
+        file_path rewrites after organizing an export) go through a single
+        executemany instead of one execute per row.
+        """
+        execute = self._execute_operation
+        pending_sql = None
+        pending_rows = []
+        for sub_operation in data['operations']:
+            if sub_operation.operation_type == SQLiteOperationType.TABLE_UPDATE:
+                statement = self._table_update_statement(sub_operation.data)
+                if statement is None:
+                    continue
+                sql, values = statement
+                if sql != pending_sql and pending_rows:
+                    self._cursor.executemany(pending_sql, pending_rows)
+                    pending_rows = []
+                pending_sql = sql
+                pending_rows.append(values)
+                continue
+            if pending_rows:
+                self._cursor.executemany(pending_sql, pending_rows)
+                pending_rows = []
+            execute(sub_operation)
+        if pending_rows:
+            self._cursor.executemany(pending_sql, pending_rows)
+    
+    @staticmethod
+    def _error_row(data: Dict[str, Any]) -> tuple:
+        """Build an errors row; hashed tracebacks live in the tracebacks table instead"""
+        traceback_hash = data.get('traceback_hash')
+        return (data['job_id'], data['timestamp'], data['error_message'],
+                None if traceback_hash else data.get('traceback'), traceback_hash,
+                data.get('context'))
+    
+    def _op_error_log(self, data: Dict[str, Any]):
+        """Insert a single error log entry"""
+        if data.get('traceback_hash'):
             self._cursor.execute(
-                "INSERT INTO errors (job_id, timestamp, error_message, traceback, context) VALUES (?, ?, ?, ?, ?)",
-                (data['job_id'], data['timestamp'], data['error_message'], 
-                 data.get('traceback'), data.get('context'))
+                "INSERT OR IGNORE INTO tracebacks (traceback_hash, traceback) VALUES (?, ?)",
+                (data['traceback_hash'], data['traceback'])
             )
+        self._cursor.execute(
+            "INSERT INTO errors (job_id, timestamp, error_message, traceback, traceback_hash, context) "
+            "VALUES (?, datetime(?, 'unixepoch', 'localtime'), ?, ?, ?, ?)",
+            self._error_row(data)
+        )
     
     def _execute_query(self, operation: SQLiteOperation):
         """Execute a SELECT query and return results"""
@@ -420,26 +906,32 @@ class SQLiteWriterQueue:
         """Flush any remaining operations during shutdown"""
         logger.info("Flushing remaining SQLite operations...")
         
-        # Process any remaining batched operations
-        if self._batch_operations:
-            self._flush_batch()
-        
-        # Process any remaining queued operations
+        # Drain remaining queued operations into large batches so each chunk is one transaction
+        # (including buffered progress); batches requeued after a failure are retried here
         remaining_count = 0
-        while True:
-            try:
-                operation = self._queue.get_nowait()
-                self._execute_operation(operation)
-                self._queue.task_done()
+        while self._queue or self._batch_operations or self._progress_state:
+            while len(self._batch_operations) < self.SHUTDOWN_FLUSH_CHUNK:
+                try:
+                    operation = self._queue.popleft()
+                except IndexError:
+                    break
                 remaining_count += 1
-            except queue.Empty:
-                break
-            except Exception as e:
-                logger.error(f"Error processing remaining operation: {e}")
+                
+                if operation.operation_type in (SQLiteOperationType.BATCH, SQLiteOperationType.QUERY):
+                    self._route_operation(operation)
+                else:
+                    self._batch_operations.append(operation)
+            
+            self._flush_batch()
         
         if remaining_count > 0:
-            self._connection.commit()
             logger.info(f"Processed {remaining_count} remaining operations")
+        
+        # Reset the WAL so a long-running writer does not leave a large -wal file behind
+        try:
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            logger.warning(f"WAL checkpoint on shutdown failed: {e}")
     
     # Public API methods
     
@@ -453,45 +945,68 @@ class SQLiteWriterQueue:
                 'db_username': db_username,
                 'status': 'running',
                 'celery_task_id': celery_task_id,
-                'start_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'start_time': int(time.time()),
                 'tables_total': tables_total
             }
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
+    
+    def _pop_progress(self, job_id: str) -> Dict[str, Any]:
+        """Remove and return buffered progress for a job so it can be ordered with a queued write"""
+        with self._progress_lock:
+            return self._progress_state.pop(job_id, None) or {}
     
     def job_update(self, job_id: str, **kwargs):
-        """Queue job update operation"""
+        """Queue job update operation, buffering progress-only updates"""
+        if kwargs and self.PROGRESS_FIELDS.issuperset(kwargs):
+            # Progress is last-writer-wins: overwrite the pending entry instead of queueing
+            with self._progress_lock:
+                pending = self._progress_state.get(job_id)
+                self._progress_state[job_id] = {**pending, **kwargs} if pending else kwargs
+            return
+        
         data = {'job_id': job_id}
+        data.update(self._pop_progress(job_id))
         data.update(kwargs)
         
         operation = SQLiteOperation(
             operation_type=SQLiteOperationType.JOB_UPDATE,
             data=data
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
+    
+    def _enqueue_pending_progress(self, job_id: str):
+        """Queue buffered progress for a job ahead of a terminal status write"""
+        progress = self._pop_progress(job_id)
+        if progress:
+            data = {'job_id': job_id}
+            data.update(progress)
+            self._enqueue(SQLiteOperation(operation_type=SQLiteOperationType.JOB_UPDATE, data=data))
     
     def job_completed(self, job_id: str):
         """Queue job completion operation"""
+        self._enqueue_pending_progress(job_id)
         operation = SQLiteOperation(
             operation_type=SQLiteOperationType.JOB_COMPLETE,
             data={
                 'job_id': job_id,
-                'end_time': time.strftime('%Y-%m-%d %H:%M:%S')
+                'end_time': int(time.time())
             }
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
     
     def job_failed(self, job_id: str, error_message: str):
         """Queue job failure operation"""
+        self._enqueue_pending_progress(job_id)
         operation = SQLiteOperation(
             operation_type=SQLiteOperationType.JOB_FAIL,
             data={
                 'job_id': job_id,
-                'end_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'end_time': int(time.time()),
                 'error_message': error_message
             }
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
     
     def table_started(self, job_id: str, table_name: str, row_count: int = 0):
         """Queue table start operation"""
@@ -501,11 +1016,11 @@ class SQLiteWriterQueue:
                 'job_id': job_id,
                 'table_name': table_name,
                 'status': 'processing',
-                'start_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'start_time': int(time.time()),
                 'row_count': row_count
             }
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
     
     def table_update(self, job_id: str, table_name: str, **kwargs):
         """Queue table update operation"""
@@ -516,7 +1031,7 @@ class SQLiteWriterQueue:
             operation_type=SQLiteOperationType.TABLE_UPDATE,
             data=data
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
     
     def table_completed(self, job_id: str, table_name: str, rows_processed: int = 0,
                        file_path: str = None, file_size_mb: float = 0, 
@@ -527,14 +1042,14 @@ class SQLiteWriterQueue:
             data={
                 'job_id': job_id,
                 'table_name': table_name,
-                'end_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'end_time': int(time.time()),
                 'rows_processed': rows_processed,
                 'file_path': file_path,
                 'file_size_mb': file_size_mb,
                 'throughput_rows_per_sec': throughput_rows_per_sec
             }
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
     
     def table_failed(self, job_id: str, table_name: str, error_message: str):
         """Queue table failure operation"""
@@ -543,30 +1058,80 @@ class SQLiteWriterQueue:
             data={
                 'job_id': job_id,
                 'table_name': table_name,
-                'end_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'end_time': int(time.time()),
                 'error_message': error_message
             }
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
     
     def log_error(self, job_id: str, error_message: str, traceback: str = None, 
                   context: str = None):
         """Queue error logging operation"""
+        # Systemic failures (e.g. bad credentials) repeat one traceback for every
+        # table; it is stored once and referenced by hash
+        traceback_hash = (hashlib.blake2b(traceback.encode(), digest_size=16).hexdigest()
+                          if traceback else None)
         operation = SQLiteOperation(
             operation_type=SQLiteOperationType.ERROR_LOG,
             data={
                 'job_id': job_id,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': int(time.time()),
                 'error_message': error_message,
                 'traceback': traceback,
+                'traceback_hash': traceback_hash,
                 'context': context
             }
         )
-        self._queue.put(operation)
+        self._enqueue(operation)
+    
+    def _get_reader_state(self) -> _ReaderState:
+        """Get the read-only connection state for the calling thread, opening it on first use"""
+        handle = getattr(self._reader_tls, 'handle', None)
+        if handle is None:
+            uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=1")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA busy_timeout=5000")
+            
+            state = _ReaderState(connection=conn)
+            handle = _ReaderHandle(state)
+            with self._reader_lock:
+                self._reader_states.add(state)
+            # Request and executor threads are short-lived; close the connection when
+            # the thread exits and its thread-local handle is released
+            weakref.finalize(handle, self._retire_reader, state)
+            self._reader_tls.handle = handle
+        return handle.state
+    
+    def _retire_reader(self, state: _ReaderState):
+        """Close the read-only connection of an exited thread, keeping its query count"""
+        with self._reader_lock:
+            if state not in self._reader_states:
+                return  # Already closed by shutdown()
+            self._reader_states.discard(state)
+            self._retired_reader_queries += state.queries
+        try:
+            state.connection.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing SQLite reader connection: {e}")
     
     def query(self, query: str, params: tuple = (), fetchone: bool = False, 
               timeout: float = 10.0):
         """Execute a SELECT query and return results"""
+        if self._direct_reads:
+            state = self._get_reader_state()
+            try:
+                cursor = state.connection.execute(query, params)
+                result = cursor.fetchone() if fetchone else cursor.fetchall()
+            except sqlite3.Error as e:
+                raise Exception(f"Query failed: {e}")
+            # Only this thread writes its counter, so no lock is needed
+            state.queries += 1
+            return result
+        
+        # Fallback: serve the query from the writer thread
         result_queue = queue.Queue()
         operation = SQLiteOperation(
             operation_type=SQLiteOperationType.QUERY,
@@ -579,7 +1144,7 @@ class SQLiteWriterQueue:
             result_queue=result_queue
         )
         
-        self._queue.put(operation)
+        self._enqueue(operation)
         
         try:
             status, result = result_queue.get(timeout=timeout)
@@ -613,7 +1178,7 @@ class SQLiteWriterQueue:
                     operation_type=SQLiteOperationType.BATCH,
                     data={'operations': batch_operations}
                 )
-                self._queue.put(batch_operation)
+                self._enqueue(batch_operation)
                 
         except Exception as e:
             logger.error(f"Error in batch context: {e}")
@@ -622,9 +1187,13 @@ class SQLiteWriterQueue:
     def get_stats(self) -> Dict[str, Any]:
         """Get current queue and processing statistics"""
         stats = dict(self._stats)
+        with self._reader_lock:
+            stats['total_queries'] += (self._retired_reader_queries +
+                                       sum(state.queries for state in self._reader_states))
         stats.update({
-            'queue_size': self._queue.qsize(),
+            'queue_size': len(self._queue),
             'batch_pending': len(self._batch_operations),
+            'progress_pending': len(self._progress_state),
             'worker_active': self._worker_thread.is_alive() if self._worker_thread else False
         })
         return stats
@@ -636,8 +1205,10 @@ class SQLiteWriterQueue:
         
         logger.info("Shutting down SQLite writer queue...")
         
-        # Signal shutdown
+        # Signal shutdown and wake the worker if it is waiting for work
         self._shutdown_event.set()
+        with self._queue_cv:
+            self._queue_cv.notify()
         
         # Wait for worker thread to finish
         if self._worker_thread and self._worker_thread.is_alive():
@@ -645,6 +1216,15 @@ class SQLiteWriterQueue:
             if self._worker_thread.is_alive():
                 logger.warning("SQLite writer thread did not shut down cleanly")
         
+        # Close reader connections
+        with self._reader_lock:
+            for state in self._reader_states:
+                try:
+                    state.connection.close()
+                except Exception as e:
+                    logger.error(f"Error closing SQLite reader connection: {e}")
+            self._reader_states.clear()
+        
         # Close database connection
         if self._connection:
             try:
@@ -655,26 +1235,42 @@ class SQLiteWriterQueue:
         logger.info("SQLite writer queue shut down")
 
 
-# Global SQLite writer instance
+# Global SQLite writer instance (one per process)
 _sqlite_writer = None
+_writer_pid = None
 _writer_lock = threading.Lock()
 
 
 def get_sqlite_writer(db_path: str = None) -> SQLiteWriterQueue:
     """Get the global SQLite writer instance"""
-    global _sqlite_writer
+    global _sqlite_writer, _writer_pid
     
-    if _sqlite_writer is None:
+    # A forked child inherits the parent's writer but not its worker thread,
+    # and SQLite connections must not be shared across fork, so build a new one
+    if _sqlite_writer is None or _writer_pid != os.getpid():
         with _writer_lock:
-            if _sqlite_writer is None:
-                import os
+            if _sqlite_writer is None or _writer_pid != os.getpid():
                 if db_path is None:
                     db_path = os.environ.get('ADU_DB_PATH', '/tmp/adu.db')
                 _sqlite_writer = SQLiteWriterQueue(db_path)
+                _writer_pid = os.getpid()
     
     return _sqlite_writer
 
 
+def shutdown_sqlite_writer():
+    """Flush and close this process's SQLite writer, if one was created"""
+    global _sqlite_writer, _writer_pid
+    
+    with _writer_lock:
+        writer = _sqlite_writer if _writer_pid == os.getpid() else None
+        _sqlite_writer = None
+        _writer_pid = None
+    
+    if writer is not None:
+        writer.shutdown()
+
+
 # Convenience functions for backwards compatibility
 def job_started(job_id: str, **kwargs):
     writer = get_sqlite_writer()
@@ -4,15 +4,32 @@ Celery tasks for ADU Export Application
 Asynchronous job processing tasks with enhanced logging and SQLite queue
 """
 
+import json
 import time
 import traceback
 from celery import current_task
+from celery.signals import worker_process_init, worker_process_shutdown
 from adu.celery_config import celery_app
-from adu.worker import process_data
+from adu.worker import process_data, is_job_cancelled, config_reference
 from adu.enhanced_logger import logger
-from adu.sqlite_writer import get_sqlite_writer
+from adu.sqlite_writer import get_sqlite_writer, shutdown_sqlite_writer
+from adu.websocket_manager import websocket_manager
 
-@celery_app.task(bind=True, name='adu.tasks.execute_export_job')
+@worker_process_init.connect
+def open_sqlite_writer(**kwargs):
+    """Open the long-lived SQLite connections once per worker process"""
+    get_sqlite_writer()
+
+
+@worker_process_shutdown.connect
+def close_sqlite_writer(**kwargs):
+    """Flush queued writes before the pool process exits (atexit hooks do not run there)"""
+    shutdown_sqlite_writer()
+
+
+# Progress is published to WebSocket subscribers and persisted in SQLite, so
+# nothing reads this task's result backend entry
+@celery_app.task(bind=True, name='adu.tasks.execute_export_job', ignore_result=True)
 def execute_export_job(self, job_id, config):
     """
     Asynchronous task to execute database export job
@@ -30,30 +47,18 @@ def execute_export_job(self, job_id, config):
     # Get SQLite writer for efficient database operations
     sqlite_writer = get_sqlite_writer()
     
-    # Update job status to 'running'
-    try:
-        sqlite_writer.job_update(
-            job_id=job_id,
-            status='running',
-            celery_task_id=task_id,
-            start_time=time.strftime('%Y-%m-%d %H:%M:%S')
-        )
-        
-        logger.info("Job status updated to 'running'")
-        
-    except Exception as e:
-        logger.error(f"Failed to update job status to running: {str(e)}")
-        # Continue execution - this is not critical
-    
-    # Update task progress
-    self.update_state(
-        state='PROGRESS',
-        meta={
+    # A job cancelled while still queued never starts
+    if is_job_cancelled(sqlite_writer, job_id):
+        logger.info(f"Job {job_id} was cancelled before it started")
+        return {
             'job_id': job_id,
-            'status': 'starting',
-            'message': 'Initializing export job...'
+            'status': 'cancelled',
+            'message': 'Export job was cancelled'
         }
-    )
+    
+    # The 'running' transition (status, task id, start time) is written once by
+    # process_data's job_started
+    websocket_manager.publish_job_status(job_id, 'running', 'Initializing export job...')
     
     try:
         # Execute the actual export process
@@ -65,20 +70,22 @@ def execute_export_job(self, job_id, config):
         logger.info(f"Processing {tables_count} tables from {db_info}")
         
         # Update progress
-        self.update_state(
-            state='PROGRESS',
-            meta={
-                'job_id': job_id,
-                'status': 'processing',
-                'message': 'Processing database export...'
-            }
-        )
+        websocket_manager.publish_job_status(job_id, 'processing', 'Processing database export...')
         
         # Call the enhanced worker processing function
-        result = process_data(job_id, config)
+        result = process_data(job_id, config, celery_task_id=task_id)
+        
+        if is_job_cancelled(sqlite_writer, job_id):
+            logger.info("Export process stopped after cancellation")
+            return {
+                'job_id': job_id,
+                'status': 'cancelled',
+                'message': 'Export job was cancelled'
+            }
         
         # Job completion is now handled by the worker's SQLite queue system
         logger.info("Export process completed successfully")
+        websocket_manager.publish_job_status(job_id, 'completed', 'Export job completed successfully')
         
         # Return success result
         return {
@@ -97,20 +104,11 @@ def execute_export_job(self, job_id, config):
         # Use SQLite writer to log the failure
         try:
             sqlite_writer.job_failed(job_id, error_message)
-            sqlite_writer.log_error(job_id, error_message, tb, str(config))
+            sqlite_writer.log_error(job_id, error_message, tb, config_reference(config))
         except Exception as e:
             logger.error(f"Failed to log job failure to database: {str(e)}")
         
-        # Update task state to failure
-        self.update_state(
-            state='FAILURE',
-            meta={
-                'job_id': job_id,
-                'status': 'failed',
-                'message': f'Export job failed: {str(exc)}',
-                'error': str(exc)
-            }
-        )
+        websocket_manager.publish_job_status(job_id, 'failed', f'Export job failed: {error_message}')
         
         # Re-raise the exception so Celery marks the task as failed
         raise exc
@@ -118,7 +116,10 @@ def execute_export_job(self, job_id, config):
 @celery_app.task(name='adu.tasks.get_job_status')
 def get_job_status(job_id):
     """
-    Get the current status of a job using SQLite writer queue
+    Get a one-shot snapshot of a job's status using SQLite writer queue
+    
+    Live status changes are pushed to WebSocket subscribers as they happen;
+    this task is for initial page loads and should not be polled.
     
     Args:
         job_id (str): Job identifier
@@ -165,13 +166,65 @@ def get_job_status(job_id):
             'error': str(e)
         }
 
+@celery_app.task(name='adu.tasks.get_job_statuses')
+def get_job_statuses(job_ids):
+    """
+    Get the current status of several jobs with a single query
+    
+    Args:
+        job_ids (list): Job identifiers
+        
+    Returns:
+        dict: Job status information keyed by job_id; unknown jobs are marked not_found
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+    if not job_ids:
+        return {}
+    
+    try:
+        sqlite_writer = get_sqlite_writer()
+        
+        statuses = {}
+        # Stay under SQLite's bound-parameter limit for very long job lists
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            query = f"""
+                SELECT job_id, status, start_time, end_time, error_message, celery_task_id,
+                       tables_total, tables_completed, tables_failed, progress_percent
+                FROM jobs WHERE job_id IN ({placeholders})
+            """
+            for row in sqlite_writer.query(query, tuple(chunk), timeout=5.0):
+                statuses[row['job_id']] = dict(row)
+        
+        for job_id in job_ids:
+            statuses.setdefault(job_id, {
+                'job_id': job_id,
+                'status': 'not_found',
+                'error': 'Job not found'
+            })
+        
+        return statuses
+        
+    except Exception as e:
+        logger.error(f"Failed to get status for {len(job_ids)} jobs: {str(e)}")
+        return {
+            job_id: {'job_id': job_id, 'status': 'error', 'error': str(e)}
+            for job_id in job_ids
+        }
+
 @celery_app.task(name='adu.tasks.cancel_job')
-def cancel_job(job_id):
+def cancel_job(job_id, force=False):
     """
     Cancel a running job using SQLite writer queue
     
+    Queued jobs never start and running jobs stop at the next chunk of the
+    table being exported (the next table for single-query exports). Only
+    force=True broadcasts a revoke to every worker to kill the task mid-chunk.
+    
     Args:
         job_id (str): Job identifier
+        force (bool): Terminate the Celery task immediately
         
     Returns:
         dict: Cancellation result
@@ -204,11 +257,13 @@ def cancel_job(job_id):
         sqlite_writer.job_update(
             job_id=job_id,
             status='cancelled',
-            end_time=time.strftime('%Y-%m-%d %H:%M:%S')
+            end_time=int(time.time())
         )
+        websocket_manager.publish_job_status(job_id, 'cancelled', 'Job cancelled')
         
-        # Revoke the Celery task if it has a task ID
-        if celery_task_id:
+        # Revoke is a broadcast control message to every worker, so reserve it
+        # for forced cancellation
+        if force and celery_task_id:
             celery_app.control.revoke(celery_task_id, terminate=True)
             logger.info(f"Revoked Celery task {celery_task_id}")
         
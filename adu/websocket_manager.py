@@ -3,20 +3,37 @@
 WebSocket Manager for Real-Time Progress Updates
 """
 
-import asyncio
 import json
-import logging
+import os
+import time
+from collections import defaultdict
 from typing import Set, Dict, Callable
+from flask import request
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from threading import Lock
+from adu.enhanced_logger import logger
+
+
+def get_message_queue_url():
+    """Redis URL shared by the web app and Celery workers for cross-process emits"""
+    return os.getenv('SOCKETIO_MESSAGE_QUEUE') or os.getenv('CELERY_BROKER_URL')
+
 
 class WebSocketManager:
     """Manages WebSocket connections for real-time updates"""
     
+    # Progress updates for a job arriving within this window are merged into one emit
+    PROGRESS_COALESCE_INTERVAL = 0.05
+    
     def __init__(self, app=None):
         self.socketio = None
         self.active_connections: Dict[str, Set[str]] = {}  # job_id -> set of session_ids
+        self._session_jobs: Dict[str, Set[str]] = defaultdict(set)  # session_id -> set of job_ids
+        self._subscriber_counts: Dict[str, int] = {}  # job_id -> len(active_connections[job_id])
         self._lock = Lock()
+        self._external = False  # True when emitting from a worker via the message queue
+        self._pending_progress: Dict[str, Dict] = {}  # job_id -> latest unsent progress
+        self._pending_lock = Lock()
         
         if app:
             self.init_app(app)
@@ -26,106 +43,180 @@ class WebSocketManager:
         self.socketio = SocketIO(
             app,
             cors_allowed_origins="*",
-            async_mode='threading',
-            logger=True,
-            engineio_logger=False
+            async_mode=os.getenv('SOCKETIO_ASYNC_MODE', 'threading'),
+            # Per-packet logging is costly under broadcast load; opt in for debugging
+            logger=os.getenv('SOCKETIO_LOGGER', 'False').lower() == 'true',
+            engineio_logger=False,
+            message_queue=get_message_queue_url()
         )
         
         # Register event handlers
         self._register_handlers()
         
-        logging.info("WebSocket manager initialized")
+        logger.info("WebSocket manager initialized")
+    
+    def init_message_queue(self, url=None):
+        """Initialize a write-only emitter for processes without the Flask app (Celery workers)
+        
+        Events are published on the Redis message queue and relayed to the
+        subscribed SocketIO rooms by the web process.
+        """
+        url = url or get_message_queue_url()
+        if not url:
+            return False
+        
+        self.socketio = SocketIO(message_queue=url)
+        self._external = True
+        logger.info("WebSocket message queue emitter initialized")
+        return True
+    
+    def _has_subscribers(self, job_id: str) -> bool:
+        """Subscribers are only tracked in the web process; workers always publish
+        
+        Deliberately lock-free: a dict membership test is atomic, and a stale
+        answer only means one emit to an empty room or one skipped update.
+        """
+        return self._external or job_id in self.active_connections
     
     def _register_handlers(self):
         """Register WebSocket event handlers"""
         
         @self.socketio.on('connect')
         def handle_connect():
-            logging.info(f"Client connected: {self.socketio.request.sid}")
+            logger.info("Client connected: %s", request.sid)
             emit('connected', {'status': 'Connected to ADU progress updates'})
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
-            session_id = self.socketio.request.sid
-            logging.info(f"Client disconnected: {session_id}")
+            session_id = request.sid
+            logger.info("Client disconnected: %s", session_id)
             
-            # Remove from all job rooms
+            # Remove from the job rooms this session subscribed to
             with self._lock:
-                for job_id, sessions in self.active_connections.items():
-                    if session_id in sessions:
-                        sessions.remove(session_id)
-                        leave_room(job_id)
-                        
-                # Clean up empty job rooms
-                self.active_connections = {
-                    job_id: sessions 
-                    for job_id, sessions in self.active_connections.items() 
-                    if sessions
-                }
+                for job_id in self._session_jobs.pop(session_id, ()):
+                    self._remove_subscriber(job_id, session_id)
+                    leave_room(job_id)
         
         @self.socketio.on('subscribe_job')
         def handle_subscribe_job(data):
             """Subscribe to updates for a specific job"""
             job_id = data.get('job_id')
-            session_id = self.socketio.request.sid
+            session_id = request.sid
             
             if job_id:
                 join_room(job_id)
                 
                 with self._lock:
-                    if job_id not in self.active_connections:
-                        self.active_connections[job_id] = set()
-                    self.active_connections[job_id].add(session_id)
+                    sessions = self.active_connections.setdefault(job_id, set())
+                    if session_id not in sessions:
+                        sessions.add(session_id)
+                        self._subscriber_counts[job_id] = self._subscriber_counts.get(job_id, 0) + 1
+                    self._session_jobs[session_id].add(job_id)
                 
                 emit('subscribed', {'job_id': job_id, 'status': 'Subscribed to job updates'})
-                logging.info(f"Client {session_id} subscribed to job {job_id}")
+                logger.info("Client %s subscribed to job %s", session_id, job_id)
         
         @self.socketio.on('unsubscribe_job')
         def handle_unsubscribe_job(data):
             """Unsubscribe from job updates"""
             job_id = data.get('job_id')
-            session_id = self.socketio.request.sid
+            session_id = request.sid
             
             if job_id:
                 leave_room(job_id)
                 
                 with self._lock:
-                    if job_id in self.active_connections:
-                        self.active_connections[job_id].discard(session_id)
-                        if not self.active_connections[job_id]:
-                            del self.active_connections[job_id]
+                    self._remove_subscriber(job_id, session_id)
+                    session_jobs = self._session_jobs.get(session_id)
+                    if session_jobs is not None:
+                        session_jobs.discard(job_id)
+                        if not session_jobs:
+                            del self._session_jobs[session_id]
                 
                 emit('unsubscribed', {'job_id': job_id, 'status': 'Unsubscribed from job updates'})
-                logging.info(f"Client {session_id} unsubscribed from job {job_id}")
+                logger.info("Client %s unsubscribed from job %s", session_id, job_id)
+    
+    def _remove_subscriber(self, job_id: str, session_id: str):
+        """Drop a session from a job, deleting the job entry once empty (caller holds the lock)"""
+        sessions = self.active_connections.get(job_id)
+        if sessions is not None and session_id in sessions:
+            sessions.remove(session_id)
+            if sessions:
+                self._subscriber_counts[job_id] -= 1
+            else:
+                del self.active_connections[job_id]
+                del self._subscriber_counts[job_id]
     
     def broadcast_job_progress(self, job_id: str, progress_data: Dict):
-        """Broadcast progress update to all subscribers of a job"""
-        if self.socketio and job_id in self.active_connections:
+        """Broadcast progress update to all subscribers of a job
+        
+        Updates are coalesced per job: the first one schedules an emit after
+        PROGRESS_COALESCE_INTERVAL and later ones merge into it, so subscribers
+        get at most one progress event per interval with the latest values.
+        """
+        if not (self.socketio and self._has_subscribers(job_id)):
+            return
+        
+        with self._pending_lock:
+            pending = self._pending_progress.get(job_id)
+            if pending is not None:
+                pending.update(progress_data)
+                return
+            self._pending_progress[job_id] = dict(progress_data)
+        
+        self.socketio.start_background_task(self._emit_pending_progress, job_id)
+    
+    def _emit_pending_progress(self, job_id: str):
+        """Emit the merged progress for a job once the coalescing window closes"""
+        self.socketio.sleep(self.PROGRESS_COALESCE_INTERVAL)
+        with self._pending_lock:
+            progress_data = self._pending_progress.pop(job_id, None)
+        
+        if progress_data is not None:
             self.socketio.emit(
                 'job_progress', 
                 progress_data, 
                 room=job_id
             )
-            logging.debug(f"Broadcasted progress for job {job_id} to {len(self.active_connections[job_id])} clients")
+            logger.debug("Broadcasted progress for job %s", job_id)
     
-    def broadcast_job_status(self, job_id: str, status: str, message: str = None):
-        """Broadcast job status change"""
-        if self.socketio and job_id in self.active_connections:
+    def broadcast_job_status(self, job_id: str, status: str, message: str = None,
+                             timestamp: float = None):
+        """Broadcast job status change (timestamp is epoch seconds, defaulting to now)"""
+        if self.socketio and self._has_subscribers(job_id):
             self.socketio.emit(
                 'job_status', 
                 {
                     'job_id': job_id,
                     'status': status,
                     'message': message,
-                    'timestamp': asyncio.get_event_loop().time() if asyncio.get_event_loop().is_running() else None
+                    'timestamp': timestamp if timestamp is not None else time.time()
                 }, 
                 room=job_id
             )
     
+    def publish_job_status(self, job_id: str, status: str, message: str = None):
+        """Publish a status change from a Celery worker; never raises into the job"""
+        try:
+            if self.socketio is None:
+                self.init_message_queue()
+            self.broadcast_job_status(job_id, status, message)
+        except Exception as e:
+            logger.warning("Failed to publish status for job %s: %s", job_id, e)
+
+    def publish_job_progress(self, job_id: str, progress_data: Dict):
+        """Publish a progress update from a Celery worker; never raises into the job"""
+        try:
+            if self.socketio is None:
+                self.init_message_queue()
+            self.broadcast_job_progress(job_id, progress_data)
+        except Exception as e:
+            logger.warning("Failed to publish progress for job %s: %s", job_id, e)
+
     def get_active_job_subscribers(self) -> Dict[str, int]:
         """Get count of active subscribers per job"""
-        with self._lock:
-            return {job_id: len(sessions) for job_id, sessions in self.active_connections.items()}
+        # A single dict copy; counts are maintained on subscribe/unsubscribe
+        return dict(self._subscriber_counts)
 
 # Global WebSocket manager instance
 websocket_manager = WebSocketManager()
\ No newline at end of file
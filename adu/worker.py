@@ -1,3 +1,4 @@
+import hashlib
 import sqlite3
 import time
 import traceback
@@ -12,16 +13,18 @@ import multiprocessing
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import psycopg2
 import vertica_python
+import pyarrow.parquet as pq
 from adu.database import get_db_connection  # Keep for backwards compatibility, but avoid using
 from adu.enhanced_logger import logger
-from adu.sqlite_writer import get_sqlite_writer
+from adu.sqlite_writer import get_sqlite_writer, SQLiteOperationType
+from adu.websocket_manager import websocket_manager
 from adu.greenplum_pool import (
     initialize_connection_pool,
     get_database_connection as get_pooled_connection,
     get_pool_stats,
     ConnectionConfig
 )
-from adu.database_type_mappings import create_polars_schema_from_database_metadata
+from adu.database_utils import get_table_schema, prefetch_table_schemas
 from adu.duckdb_exporter import (
     export_small_table_duckdb,
     export_table_chunk_duckdb,
@@ -195,24 +198,64 @@ class ProgressManager:
             logging.warning(f"Poor performance detected on {self.table_name}: {current_throughput:.0f} rows/sec. "
                            f"DuckDB method typically achieves 50,000+ rows/sec for similar tables.")
 
+# Patterns to redact, compiled once for the logging hot path
+_REDACT_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in [
+        (r'gAAAAA[A-Za-z0-9_\-=]+', r'***ENCRYPTED_PASSWORD***'),
+        (r'(password|pwd|pass|secret|token|api_key|access_key)\s*[:=]\s*[^\s,]+', r'\1=***REDACTED***'),
+        # Unencoded passwords may contain '/', so the password is bounded by length
+        # instead; otherwise every '://' would scan to the end of a long line
+        (r'://([^:/\s@]+):([^\s@]{1,256})@', r'://\1:***REDACTED***@'),
+    ]
+]
+# Lowercase substrings at least one of which must be present for any pattern to match
+_REDACT_MARKERS = ('gaaaaa', 'pass', 'pwd', 'secret', 'token', 'api_key', 'access_key', '://')
+# Shortest text any pattern can match ("pwd=x")
+_REDACT_MIN_LENGTH = 5
+
 def redact_sensitive_data(text):
     """Redact sensitive information from log messages"""
-    if not isinstance(text, str):
+    if type(text) is not str:
+        if text is None or isinstance(text, (int, float)):
+            return text
         text = str(text)
     
-    # Patterns to redact
-    patterns = [
-        (r'gAAAAA[A-Za-z0-9_\-=]+', r'***ENCRYPTED_PASSWORD***'),
-        (r'(password|pwd|pass|secret|token|api_key|access_key)\s*[:=]\s*[^\s,]+', r'\1=***REDACTED***'),
-        (r'://([^:]+):([^@]+)@', r'://\1:***REDACTED***@'),
-    ]
+    if len(text) < _REDACT_MIN_LENGTH:
+        return text
+    
+    # Most log lines contain none of the markers; skip the regex passes for them
+    lowered = text.lower()
+    if not any(marker in lowered for marker in _REDACT_MARKERS):
+        return text
     
     redacted_text = text
-    for pattern, replacement in patterns:
-        redacted_text = re.sub(pattern, replacement, redacted_text, flags=re.IGNORECASE)
+    for pattern, replacement in _REDACT_PATTERNS:
+        redacted_text = pattern.sub(replacement, redacted_text)
     
     return redacted_text
 
+def _redact_arg(arg):
+    """Redact a log record argument, returning it unchanged when nothing was redacted"""
+    # Counts, sizes and timings are the common args and can never hold a secret
+    if arg is None or isinstance(arg, (int, float)):
+        return arg
+    text = str(arg)
+    redacted = redact_sensitive_data(text)
+    return arg if redacted == text else redacted
+
+def config_reference(config, **context):
+    """
+    Compact error-log context pointing at the job's config instead of copying it
+    
+    The full config (including credentials) is already stored once in
+    job_configs; the hash matches sha1 of that row when the config is unchanged.
+    """
+    config_json = json.dumps(config)
+    return json.dumps(dict(context, **{
+        'config': 'job_configs',
+        'config_sha1': hashlib.sha1(config_json.encode('utf-8')).hexdigest()
+    }), separators=(',', ':'))
+
 class SensitiveDataFilter(logging.Filter):
     """Logging filter to redact sensitive information"""
     def filter(self, record):
@@ -221,9 +264,10 @@ class SensitiveDataFilter(logging.Filter):
             if hasattr(record, 'msg') and record.msg:
                 record.msg = redact_sensitive_data(record.msg)
             
-            # Redact any args that might contain sensitive data
+            # Redact any args that might contain sensitive data; untouched args keep
+            # their type so numeric format specifiers still work
             if hasattr(record, 'args') and record.args:
-                record.args = tuple(redact_sensitive_data(str(arg)) if arg is not None else arg for arg in record.args)
+                record.args = tuple(_redact_arg(arg) for arg in record.args)
         except Exception:
             # If redaction fails, just continue with the original record
             pass
@@ -279,18 +323,52 @@ def initialize_global_connection_pool(db_type, host, port, username, password, d
         logger.error(f"Failed to initialize connection pool: {e}")
         raise
 
-def discover_schemas(db_conn, db_type):
+# Catalog queries are slow (notably on Vertica) and the UI repeats them for every
+# schema it expands, so results are cached briefly per source database
+CATALOG_CACHE_TTL = 300
+_catalog_cache = {}
+_catalog_cache_lock = threading.Lock()
+
+def _cached_catalog(cache_key, loader):
+    """Return loader() through the catalog cache; cache_key=None bypasses it"""
+    if cache_key is None:
+        return loader()
+    
+    now = time.time()
+    with _catalog_cache_lock:
+        entry = _catalog_cache.get(cache_key)
+    if entry is not None and now - entry[0] < CATALOG_CACHE_TTL:
+        return entry[1]
+    
+    value = loader()
+    with _catalog_cache_lock:
+        _catalog_cache[cache_key] = (now, value)
+    return value
+
+def discover_schemas(db_conn, db_type, cache_key=None):
     """Discover all user schemas in the database"""
+    schemas = _cached_catalog(
+        cache_key and (cache_key, 'schemas'),
+        lambda: _query_schemas(db_conn, db_type)
+    )
+    logging.info("Discovered %d schemas", len(schemas))
+    logging.debug("Schemas: %s", schemas)
+    return schemas
+
+def _query_schemas(db_conn, db_type):
+    """Query the user schema names from the database catalog"""
     cursor = db_conn.cursor()
     
     if db_type.lower() in ['postgresql', 'greenplum']:
+        # pg_catalog directly: the information_schema views add per-row joins and privilege checks
         cursor.execute("""
-            SELECT schema_name 
-            FROM information_schema.schemata 
-            WHERE schema_name NOT IN ('information_schema', 'pg_catalog', 'pg_toast_temp_1', 'pg_temp_1')
-            AND schema_name NOT LIKE 'pg_%'
-            AND schema_name NOT LIKE 'gp_%'
-            ORDER BY schema_name
+            SELECT n.nspname 
+            FROM pg_catalog.pg_namespace n 
+            WHERE n.nspname NOT IN ('information_schema', 'pg_catalog', 'pg_toast_temp_1', 'pg_temp_1')
+            AND n.nspname NOT LIKE 'pg_%'
+            AND n.nspname NOT LIKE 'gp_%'
+            AND (pg_has_role(n.nspowner, 'USAGE') OR has_schema_privilege(n.oid, 'USAGE'))
+            ORDER BY n.nspname
         """)
     elif db_type.lower() == 'vertica':
         cursor.execute("""
@@ -302,46 +380,77 @@ def discover_schemas(db_conn, db_type):
     
     schemas = [row[0] for row in cursor.fetchall()]
     cursor.close()
-    logging.info(f"Discovered {len(schemas)} schemas: {schemas}")
     return schemas
 
-def discover_tables_by_schema(db_conn, db_type, schema_name=None):
-    """Discover tables in a specific schema or all schemas"""
+def discover_tables_by_schema(db_conn, db_type, schema_name=None, cache_key=None):
+    """Discover tables in a specific schema or all schemas
+    
+    With a cache_key, all tables are fetched in one query and cached, and
+    per-schema lookups are answered from that list.
+    """
+    if cache_key is not None:
+        all_tables = _cached_catalog((cache_key, 'tables'),
+                                     lambda: _query_tables(db_conn, db_type, None))
+        tables = [t for t in all_tables if schema_name is None or t['schema'] == schema_name]
+    else:
+        tables = _query_tables(db_conn, db_type, schema_name)
+    
+    logging.info("Discovered %d tables in schema '%s'", len(tables), schema_name or 'all')
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("First tables: %s%s", [t['full_name'] for t in tables[:10]],
+                      '...' if len(tables) > 10 else '')
+    return tables
+
+# Unquoted [schema.]table identifiers; table names are interpolated into SQL and paths
+_TABLE_NAME_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_$]*(?:\.[A-Za-z_][A-Za-z0-9_$]*)?')
+
+def is_valid_table_name(table_name):
+    """Check that a table name is a plain (optionally schema-qualified) identifier"""
+    return isinstance(table_name, str) and _TABLE_NAME_RE.fullmatch(table_name) is not None
+
+def _iter_rows(cursor, batch_size=10000):
+    """Yield cursor rows in fetchmany batches instead of materializing fetchall()"""
+    for rows in iter(lambda: cursor.fetchmany(batch_size), []):
+        yield from rows
+
+def _query_tables(db_conn, db_type, schema_name):
+    """Query tables in a specific schema or all schemas from the database catalog"""
     cursor = db_conn.cursor()
     
     if db_type.lower() in ['postgresql', 'greenplum']:
         if schema_name:
             # Get tables for specific schema
             cursor.execute("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = %s 
-                AND table_type = 'BASE TABLE'
-                ORDER BY table_name
+                SELECT n.nspname, c.relname 
+                FROM pg_catalog.pg_class c 
+                JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace 
+                WHERE n.nspname = %s 
+                AND c.relkind IN ('r', 'p')
+                AND has_table_privilege(c.oid, 'SELECT')
+                ORDER BY c.relname
             """, (schema_name,))
-            tables = [{'schema': schema_name, 'table': row[0], 'full_name': f"{schema_name}.{row[0]}"} for row in cursor.fetchall()]
         else:
             # Get all tables with schema info
             cursor.execute("""
-                SELECT table_schema, table_name 
-                FROM information_schema.tables 
-                WHERE table_type = 'BASE TABLE'
-                AND table_schema NOT IN ('information_schema', 'pg_catalog', 'pg_toast_temp_1', 'pg_temp_1')
-                AND table_schema NOT LIKE 'pg_%'
-                AND table_schema NOT LIKE 'gp_%'
-                ORDER BY table_schema, table_name
+                SELECT n.nspname, c.relname 
+                FROM pg_catalog.pg_class c 
+                JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace 
+                WHERE c.relkind IN ('r', 'p')
+                AND n.nspname NOT IN ('information_schema', 'pg_catalog', 'pg_toast_temp_1', 'pg_temp_1')
+                AND n.nspname NOT LIKE 'pg_%'
+                AND n.nspname NOT LIKE 'gp_%'
+                AND has_table_privilege(c.oid, 'SELECT')
+                ORDER BY n.nspname, c.relname
             """)
-            tables = [{'schema': row[0], 'table': row[1], 'full_name': f"{row[0]}.{row[1]}"} for row in cursor.fetchall()]
             
     elif db_type.lower() == 'vertica':
         if schema_name:
             cursor.execute("""
-                SELECT table_name 
+                SELECT schema_name, table_name 
                 FROM v_catalog.tables 
                 WHERE schema_name = %s
                 ORDER BY table_name
             """, (schema_name,))
-            tables = [{'schema': schema_name, 'table': row[0], 'full_name': f"{schema_name}.{row[0]}"} for row in cursor.fetchall()]
         else:
             cursor.execute("""
                 SELECT schema_name, table_name 
@@ -349,162 +458,17 @@ def discover_tables_by_schema(db_conn, db_type, schema_name=None):
                 WHERE schema_name NOT IN ('v_catalog', 'v_monitor', 'v_internal')
                 ORDER BY schema_name, table_name
             """)
-            tables = [{'schema': row[0], 'table': row[1], 'full_name': f"{row[0]}.{row[1]}"} for row in cursor.fetchall()]
     
+    tables = [{'schema': schema, 'table': table, 'full_name': f"{schema}.{table}"}
+              for schema, table in _iter_rows(cursor)]
     cursor.close()
-    logging.info(f"Discovered {len(tables)} tables in schema '{schema_name or 'all'}': {[t['full_name'] for t in tables[:10]]}{'...' if len(tables) > 10 else ''}")
     return tables
 
-def discover_tables(db_conn, db_type):
+def discover_tables(db_conn, db_type, cache_key=None):
     """Legacy function for backward compatibility - discovers all tables with full names"""
-    tables_info = discover_tables_by_schema(db_conn, db_type)
+    tables_info = discover_tables_by_schema(db_conn, db_type, cache_key=cache_key)
     return [table['full_name'] for table in tables_info]
 
-def get_table_schema(db_conn, db_type, table_name):
-    """
-    Get the schema (column information) for a specific table
-    
-    Args:
-        db_conn: Database connection
-        db_type: Database type ('postgresql', 'greenplum', 'vertica')
-        table_name: Full table name (schema.table or just table)
-        
-    Returns:
-        dict: Polars schema mapping column names to types
-    """
-    cursor = db_conn.cursor()
-    
-    try:
-        # Parse schema and table name
-        if '.' in table_name:
-            schema_name, table_only = table_name.split('.', 1)
-        else:
-            schema_name = 'public'
-            table_only = table_name
-        
-        logging.info(f"Getting schema for {table_name} (parsed as schema='{schema_name}', table='{table_only}')")
-        
-        # First, verify table exists
-        table_exists = _verify_table_exists(cursor, db_type, schema_name, table_only, table_name)
-        if not table_exists:
-            return None
-        
-        # Try primary schema query (case-insensitive)
-        columns_metadata = _get_schema_primary(cursor, db_type, schema_name, table_only, table_name)
-        
-        # If primary failed, try fallback query
-        if not columns_metadata and db_type.lower() in ['postgresql', 'greenplum']:
-            logging.warning(f"Primary schema query failed for {table_name}, trying fallback method")
-            columns_metadata = _get_schema_fallback(cursor, schema_name, table_only, table_name)
-        
-        if not columns_metadata:
-            logging.error(f"No schema information found for table {table_name} using any method")
-            return None
-        
-        # Create Polars schema from database metadata
-        polars_schema = create_polars_schema_from_database_metadata(columns_metadata, db_type)
-        
-        logging.info(f"Retrieved schema for {table_name}: {len(columns_metadata)} columns")
-        return polars_schema
-        
-    except Exception as e:
-        logging.error(f"Failed to get schema for table {table_name}: {str(e)}")
-        logging.error(f"Exception details: {type(e).__name__}: {str(e)}")
-        return None
-    finally:
-        cursor.close()
-
-def _verify_table_exists(cursor, db_type, schema_name, table_only, full_table_name):
-    """Verify that the table exists before attempting schema detection"""
-    try:
-        logging.info(f"Verifying table existence: {full_table_name}")
-        
-        if db_type.lower() in ['postgresql', 'greenplum']:
-            # Check if table exists (case-insensitive)
-            cursor.execute("""
-                SELECT 1 FROM information_schema.tables 
-                WHERE LOWER(table_schema) = LOWER(%s) AND LOWER(table_name) = LOWER(%s)
-                LIMIT 1
-            """, (schema_name, table_only))
-        elif db_type.lower() == 'vertica':
-            cursor.execute("""
-                SELECT 1 FROM v_catalog.tables 
-                WHERE LOWER(schema_name) = LOWER(%s) AND LOWER(table_name) = LOWER(%s)
-                LIMIT 1
-            """, (schema_name, table_only))
-        
-        exists = cursor.fetchone() is not None
-        if not exists:
-            logging.error(f"Table {full_table_name} does not exist in database")
-        else:
-            logging.debug(f"Table {full_table_name} exists")
-        return exists
-        
-    except Exception as e:
-        logging.error(f"Error verifying table existence for {full_table_name}: {str(e)}")
-        return False
-
-def _get_schema_primary(cursor, db_type, schema_name, table_only, full_table_name):
-    """Primary schema query using information_schema (case-insensitive)"""
-    try:
-        if db_type.lower() in ['postgresql', 'greenplum']:
-            query = """
-                SELECT column_name, data_type, character_maximum_length, is_nullable
-                FROM information_schema.columns 
-                WHERE LOWER(table_schema) = LOWER(%s) AND LOWER(table_name) = LOWER(%s)
-                ORDER BY ordinal_position
-            """
-            logging.debug(f"Executing primary schema query for {full_table_name}")
-            cursor.execute(query, (schema_name, table_only))
-            
-        elif db_type.lower() == 'vertica':
-            query = """
-                SELECT column_name, data_type, character_maximum_length, is_nullable
-                FROM v_catalog.columns 
-                WHERE LOWER(schema_name) = LOWER(%s) AND LOWER(table_name) = LOWER(%s)
-                ORDER BY ordinal_position
-            """
-            logging.debug(f"Executing primary schema query for {full_table_name}")
-            cursor.execute(query, (schema_name, table_only))
-        else:
-            raise ValueError(f"Unsupported database type: {db_type}")
-        
-        columns_metadata = cursor.fetchall()
-        logging.debug(f"Primary schema query returned {len(columns_metadata)} columns for {full_table_name}")
-        return columns_metadata
-        
-    except Exception as e:
-        logging.error(f"Primary schema query failed for {full_table_name}: {str(e)}")
-        return []
-
-def _get_schema_fallback(cursor, schema_name, table_only, full_table_name):
-    """Fallback schema query using pg_class and pg_attribute"""
-    try:
-        query = """
-            SELECT a.attname as column_name,
-                   pg_catalog.format_type(a.atttypid, a.atttypmod) as data_type,
-                   CASE WHEN a.atttypmod > 4 THEN a.atttypmod - 4 ELSE NULL END as character_maximum_length,
-                   CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END as is_nullable
-            FROM pg_class c
-            JOIN pg_namespace n ON n.oid = c.relnamespace
-            JOIN pg_attribute a ON a.attrelid = c.oid
-            WHERE LOWER(n.nspname) = LOWER(%s) 
-            AND LOWER(c.relname) = LOWER(%s)
-            AND a.attnum > 0 
-            AND NOT a.attisdropped
-            ORDER BY a.attnum
-        """
-        logging.debug(f"Executing fallback schema query for {full_table_name}")
-        cursor.execute(query, (schema_name, table_only))
-        
-        columns_metadata = cursor.fetchall()
-        logging.debug(f"Fallback schema query returned {len(columns_metadata)} columns for {full_table_name}")
-        return columns_metadata
-        
-    except Exception as e:
-        logging.error(f"Fallback schema query failed for {full_table_name}: {str(e)}")
-        return []
-
 def verify_table_integrity_duckdb(table_dir, exported_files, total_exported_rows, expected_rows, table_name):
     """Verify data integrity for DuckDB exports without loading into memory"""
     try:
@@ -647,11 +611,13 @@ def check_existing_export(table_dir, expected_row_count, table_name):
                 return True
         
         # If no metadata or incomplete, check if we have parquet files to clean up
-        parquet_files = list(table_dir.glob("*.parquet"))
+        with os.scandir(table_dir) as entries:
+            parquet_files = [entry.path for entry in entries
+                             if entry.name.endswith('.parquet') and entry.is_file()]
         if parquet_files:
             logging.warning(f"Found incomplete export for {table_name}, cleaning up {len(parquet_files)} files")
-            for file in parquet_files:
-                file.unlink()
+            for file_path in parquet_files:
+                os.unlink(file_path)
             if metadata_file.exists():
                 metadata_file.unlink()
         
@@ -817,9 +783,12 @@ def organize_completed_export(job_id, output_path, config=None):
                     # Ensure parent directory exists
                     actual_final_path.parent.mkdir(parents=True, exist_ok=True)
                     
-                    # Move the entire table directory
-                    import shutil
-                    shutil.move(str(table_temp_dir), str(actual_final_path))
+                    # Move the entire table directory; a rename when temp and final share a filesystem
+                    try:
+                        os.rename(table_temp_dir, actual_final_path)
+                    except OSError:
+                        import shutil
+                        shutil.move(str(table_temp_dir), str(actual_final_path))
                     
                     # Update metadata with final location
                     metadata_file = actual_final_path / "_export_metadata.json"
@@ -857,9 +826,13 @@ def organize_completed_export(job_id, output_path, config=None):
         
         # Clean up temporary directory
         try:
-            import shutil
             if temp_job_path.exists():
-                shutil.rmtree(temp_job_path)
+                try:
+                    # Every table directory was renamed out, so this is normally empty
+                    os.rmdir(temp_job_path)
+                except OSError:
+                    import shutil
+                    shutil.rmtree(temp_job_path)
             logging.info(f"Cleaned up temporary directory for job {job_id}")
         except Exception as e:
             logging.warning(f"Failed to clean up temp directory for job {job_id}: {str(e)}")
@@ -1068,26 +1041,25 @@ def archive_job_metadata(job_id, organization_info, output_path):
 def update_database_paths_after_organization(job_id, moved_tables):
     """Update database with new file paths after reorganization"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        for table_info in moved_tables:
-            table_name = table_info['table'].replace('_', '.')  # Convert back to original format
-            new_path = table_info['final_path']
-            
-            cursor.execute(
-                "UPDATE table_exports SET file_path = ? WHERE job_id = ? AND table_name = ?",
-                (new_path, job_id, table_name)
-            )
-        
-        conn.commit()
-        conn.close()
+        # All path updates are applied by the SQLite writer in a single transaction
+        with get_sqlite_writer().batch_context() as batch:
+            for table_info in moved_tables:
+                table_name = table_info['table'].replace('_', '.')  # Convert back to original format
+                batch.add_operation(SQLiteOperationType.TABLE_UPDATE, {
+                    'job_id': job_id,
+                    'table_name': table_name,
+                    'file_path': table_info['final_path']
+                })
         
         logging.info(f"Updated database paths for {len(moved_tables)} tables in job {job_id}")
         
     except Exception as e:
         logging.error(f"Failed to update database paths for job {job_id}: {str(e)}")
 
+# Matches the DuckDB COPY settings in duckdb_exporter (zstd level 1); polars
+# dictionary-encodes columns and writes statistics by default
+PARQUET_WRITE_OPTIONS = {'compression': 'zstd', 'compression_level': 1, 'statistics': True}
+
 def export_small_table_single_file(db_config, table_name, table_dir, source_row_count, db_type='postgresql'):
     """Export small table as a single Parquet file"""
     try:
@@ -1149,16 +1121,15 @@ def export_small_table_single_file(db_config, table_name, table_dir, source_row_
         temp_file = table_dir / "data.tmp"
         
         try:
-            df.write_parquet(temp_file)
+            df.write_parquet(temp_file, **PARQUET_WRITE_OPTIONS)
             temp_file.rename(parquet_file)
         except Exception as write_error:
             if temp_file.exists():
                 temp_file.unlink()
             raise write_error
         
-        # Post-export validation
-        verification_df = pl.read_parquet(parquet_file)
-        parquet_row_count = len(verification_df)
+        # Post-export validation from the footer; re-reading the data only to count it doubles the IO
+        parquet_row_count = pq.ParquetFile(parquet_file).metadata.num_rows
         
         if parquet_row_count != source_row_count:
             error_msg = f"Post-export validation failed: source has {source_row_count} rows, Parquet file has {parquet_row_count} rows"
@@ -1405,16 +1376,15 @@ def export_large_table_partitioned(db_config, table_name, table_dir, source_row_
                 temp_file = table_dir / f"part_{chunk_num + 1:04d}.tmp"
                 
                 try:
-                    df_chunk.write_parquet(temp_file)
+                    df_chunk.write_parquet(temp_file, **PARQUET_WRITE_OPTIONS)
                     temp_file.rename(chunk_file)
                 except Exception as write_error:
                     if temp_file.exists():
                         temp_file.unlink()
                     raise write_error
                 
-                # Verify chunk
-                verification_df = pl.read_parquet(chunk_file)
-                verified_count = len(verification_df)
+                # Verify chunk from the footer row count
+                verified_count = pq.ParquetFile(chunk_file).metadata.num_rows
                 
                 if verified_count != chunk_row_count:
                     error_msg = f"Chunk {chunk_num + 1} verification failed: expected {chunk_row_count}, got {verified_count}"
@@ -1911,17 +1881,15 @@ def export_large_table_parallel_chunks(db_conn_params, table_name, table_dir, pa
                 # Optimized Parquet writing for large datasets
                 df_chunk.write_parquet(
                     temp_file,
-                    compression="zstd",  # Better compression ratio for large files
-                    compression_level=3,  # Balanced speed/compression
+                    **PARQUET_WRITE_OPTIONS,
                     row_group_size=100000,  # Optimize for query performance
                     use_pyarrow=True
                 )
                 
                 temp_file.rename(chunk_file)
                 
-                # Verify chunk without reading entire file back
-                parquet_info = pl.scan_parquet(chunk_file).select(pl.len()).collect()
-                verified_count = parquet_info[0, 0]
+                # Verify chunk from the footer without reading the file back
+                verified_count = pq.ParquetFile(chunk_file).metadata.num_rows
                 
                 if verified_count != chunk_row_count:
                     raise ValueError(f"Chunk verification failed: expected {chunk_row_count}, got {verified_count}")
@@ -2173,6 +2141,9 @@ def export_table_to_parquet(db_conn, table_name, output_path, job_id, chunk_size
     Returns:
         tuple: (success: bool, row_count: int or error_message: str)
     """
+    if not is_valid_table_name(table_name):
+        return False, f"Invalid table name: {table_name!r}"
+    
     try:
         # First, get the source table row count and analyze partitioning strategy
         source_count_query = f"SELECT COUNT(*) FROM {table_name}"
@@ -2237,7 +2208,6 @@ def export_table_to_parquet(db_conn, table_name, output_path, job_id, chunk_size
 
 def process_single_table(job_id, table_name, db_conn_params, output_path, chunk_size, max_chunk_workers=None, config=None):
     """Process a single table using smart export method selection"""
-    table_start_time = time.strftime('%Y-%m-%d %H:%M:%S')
     db_type = db_conn_params.get('db_type', 'postgresql')
     
     # Get SQLite writer for thread-safe database operations
@@ -2311,8 +2281,6 @@ def process_single_table(job_id, table_name, db_conn_params, output_path, chunk_
             )
         
         # Update SQLite with results using queue system
-        table_end_time = time.strftime('%Y-%m-%d %H:%M:%S')
-        
         if success:
             # Calculate file size
             total_size_mb = 0
@@ -2353,12 +2321,88 @@ def process_single_table(job_id, table_name, db_conn_params, output_path, chunk_
         # Log error via SQLite queue
         sqlite_writer.table_failed(job_id, table_name, error_msg)
         sqlite_writer.log_error(job_id, error_msg, traceback.format_exc(), 
-                               json.dumps({"table": table_name, "config": config}))
+                               config_reference(config, table=table_name))
         
         return {'table': table_name, 'status': 'failed', 'result': error_msg}
 
 
-def process_data(job_id, config):
+def is_job_cancelled(sqlite_writer, job_id):
+    """Check whether cancel_job has marked the job cancelled"""
+    row = sqlite_writer.query("SELECT status FROM jobs WHERE job_id = ?", (job_id,), fetchone=True)
+    return row is not None and row['status'] == 'cancelled'
+
+
+def export_single_table(job_id, table_name, config, sqlite_writer, job_output_dir):
+    """
+    Export one table of a job with smart method selection into job_output_dir/table_name
+    
+    Returns:
+        dict: Result entry for the table, or None if the job was cancelled
+    """
+    # Cancellation is cooperative: tables not yet started are skipped, and chunked
+    # exports check between chunks so a running table stops early too
+    if is_job_cancelled(sqlite_writer, job_id):
+        return None
+    
+    if not is_valid_table_name(table_name):
+        logger.error("Rejecting invalid table name: %r", table_name)
+        return {'table': table_name, 'status': 'failed', 'error': 'Invalid table name'}
+    
+    try:
+        logger.info("Processing table: %s", table_name)
+        
+        # Use smart export to automatically select optimal method
+        table_output_dir = job_output_dir / table_name
+        
+        success, rows_exported, method_used = smart_export_table(
+            job_id=job_id,
+            table_name=table_name,
+            output_dir=table_output_dir,
+            db_type=config['db_type'],
+            db_config=config,
+            should_cancel=lambda: is_job_cancelled(sqlite_writer, job_id)
+        )
+        
+        if success:
+            # Note: table completion tracking is now handled inside smart_export_table()
+            # to avoid duplication and ensure proper file path and size calculation
+            logger.info("Table %s completed: %d rows using %s", table_name, rows_exported, method_used)
+            return {
+                'table': table_name, 
+                'status': 'completed', 
+                'rows': rows_exported, 
+                'method': method_used
+            }
+        
+        if is_job_cancelled(sqlite_writer, job_id):
+            logger.info("Table %s stopped after the job was cancelled", table_name)
+            return None
+        
+        # Note: table failure tracking is now handled inside smart_export_table()
+        logger.error("Table %s failed using %s", table_name, method_used)
+        return {
+            'table': table_name, 
+            'status': 'failed', 
+            'method': method_used
+        }
+            
+    except Exception as e:
+        logger.error("Error processing table %s: %s", table_name, e)
+        # Handle processing errors that occur outside smart_export_table()
+        try:
+            sqlite_writer.table_update(job_id, table_name, status='failed', 
+                                     error_message=f"Processing error: {str(e)}")
+        except:
+            pass  # Don't let SQLite errors propagate
+            
+        return {
+            'table': table_name, 
+            'status': 'failed', 
+            'error': str(e)
+        }
+
+
+def process_data(job_id, config, celery_task_id=None):
     """Main data processing function with enhanced logging and connection pooling"""
     
     # Record job start time
@@ -2377,7 +2421,9 @@ def process_data(job_id, config):
         logger.info(f"Job {job_id} already completed, skipping execution")
         return
     
-    sqlite_writer.job_started(job_id, config.get('db_username'), tables_total=total_tables)
+    # Single start write: status, task id, start time and table count together
+    sqlite_writer.job_started(job_id, config.get('db_username'), celery_task_id=celery_task_id,
+                              tables_total=total_tables)
     
     # Initialize progress tracking
     completed_tables = 0
@@ -2399,38 +2445,44 @@ def process_data(job_id, config):
         sqlite_writer.job_update(job_id=job_id, status='failed', error_message=f"Connection pool error: {str(e)}")
         return []
     
-    # Process each table using smart export
+    # One catalog query for every table's columns instead of one per table (and
+    # per range chunk); a failure only means tables look their schema up themselves
+    try:
+        with get_pooled_connection() as db_conn:
+            prefetch_table_schemas(db_conn, config['db_type'], config.get('tables', []))
+    except Exception as e:
+        logger.warning("Schema prefetch failed, falling back to per-table lookups: %s", e)
+    
+    # Tables are independent exports and can run several at once; bookkeeping and
+    # progress stay on this thread as each one finishes. Each table already fans out
+    # to up to 16 chunk workers that ATTACH to the source outside the 6-connection
+    # pool, so parallel tables multiply source sessions: sequential unless configured
+    max_parallel_tables = max(1, min(int(config.get('max_parallel_tables', 1)), total_tables or 1))
+    logger.info("Exporting %d tables with up to %d in parallel", total_tables, max_parallel_tables)
+    
+    # Created once here so each table only has to create its own directory
+    job_output_dir = Path(config.get('output_path', '/app/exports')) / job_id
+    job_output_dir.mkdir(parents=True, exist_ok=True)
+    
     results = []
-    for table_name in config['tables']:
-        try:
-            logger.info(f"Processing table: {table_name}")
-            
-            # Use smart export to automatically select optimal method
-            # Create table-specific output directory
-            table_output_dir = Path(config.get('output_path', '/app/exports')) / job_id / table_name
-            
-            success, rows_exported, method_used = smart_export_table(
-                job_id=job_id,
-                table_name=table_name,
-                output_dir=table_output_dir,
-                db_type=config['db_type'],
-                db_config=config
-            )
+    with ThreadPoolExecutor(max_workers=max_parallel_tables,
+                            thread_name_prefix=f"export-{job_id[:8]}") as executor:
+        futures = [
+            executor.submit(export_single_table, job_id, table_name, config, sqlite_writer,
+                            job_output_dir)
+            for table_name in config['tables']
+        ]
+        
+        for future in as_completed(futures):
+            result = future.result()
+            if result is None:
+                continue  # Skipped after cancellation
+            results.append(result)
             
-            if success:
-                # Note: table completion tracking is now handled inside smart_export_table()
-                # to avoid duplication and ensure proper file path and size calculation
-                results.append({
-                    'table': table_name, 
-                    'status': 'completed', 
-                    'rows': rows_exported, 
-                    'method': method_used
-                })
-                logger.info(f"Table {table_name} completed: {rows_exported:,} rows using {method_used}")
-                
+            if result['status'] == 'completed':
                 # Update progress tracking
                 completed_tables += 1
-                total_rows_processed += rows_exported
+                total_rows_processed += result['rows']
                 progress_percent = int((completed_tables / total_tables) * 100)
                 
                 # Update enhanced logger job context progress
@@ -2441,36 +2493,20 @@ def process_data(job_id, config):
                 elapsed_time = current_time - job_start_time
                 throughput = int(total_rows_processed / elapsed_time) if elapsed_time > 0 else 0
                 
-                sqlite_writer.job_update(
-                    job_id=job_id,
-                    progress_percent=progress_percent,
-                    tables_completed=completed_tables,
-                    rows_processed=total_rows_processed,
-                    throughput_rows_per_sec=throughput
+                progress = {
+                    'progress_percent': progress_percent,
+                    'tables_completed': completed_tables,
+                    'rows_processed': total_rows_processed,
+                    'throughput_rows_per_sec': throughput
+                }
+                sqlite_writer.job_update(job_id=job_id, **progress)
+                websocket_manager.publish_job_progress(
+                    job_id, {'job_id': job_id, 'timestamp': current_time, **progress}
                 )
-            else:
-                # Note: table failure tracking is now handled inside smart_export_table()
-                results.append({
-                    'table': table_name, 
-                    'status': 'failed', 
-                    'method': method_used
-                })
-                logger.error(f"Table {table_name} failed using {method_used}")
-                
-        except Exception as e:
-            logger.error(f"Error processing table {table_name}: {str(e)}")
-            # Handle processing errors that occur outside smart_export_table()
-            try:
-                sqlite_writer.table_update(job_id, table_name, status='failed', 
-                                         error_message=f"Processing error: {str(e)}")
-            except:
-                pass  # Don't let SQLite errors propagate
-                
-            results.append({
-                'table': table_name, 
-                'status': 'failed', 
-                'error': str(e)
-            })
+    
+    if is_job_cancelled(sqlite_writer, job_id):
+        logger.info("Job %s was cancelled, skipped remaining tables", job_id)
+        return results
     
     # Update job completion status
     total_completed = sum(1 for r in results if r['status'] == 'completed')
@@ -2486,7 +2522,7 @@ def process_data(job_id, config):
             progress_percent=100,
             tables_completed=total_completed,
             tables_failed=0,
-            end_time=time.strftime('%Y-%m-%d %H:%M:%S')
+            end_time=int(time.time())
         )
         logger.job_completed(job_id, job_duration, total_completed, 0)
     else:
@@ -2497,7 +2533,7 @@ def process_data(job_id, config):
             progress_percent=100,
             tables_completed=total_completed,
             tables_failed=total_failed,
-            end_time=time.strftime('%Y-%m-%d %H:%M:%S')
+            end_time=int(time.time())
         )
         logger.job_completed(job_id, job_duration, total_completed, total_failed)
     
@@ -2505,38 +2541,60 @@ def process_data(job_id, config):
 
 
 def poll_for_jobs():
-    while True:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM jobs WHERE overall_status = 'queued' ORDER BY start_time LIMIT 1")
-        job = cursor.fetchone()
-        conn.close()
-
-        if job:
-            job_id = job['job_id']
-            logging.info(f"Found queued job: {job_id}")
+    # One connection for the poller's lifetime; get_db_connection applies the WAL pragmas once
+    conn = get_db_connection()
+    last_version = None
+    try:
+        while True:
+            # data_version only changes when another connection commits, so an idle
+            # poller skips the jobs query until something has been written
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == last_version:
+                time.sleep(1)
+                continue
             
-            conn = get_db_connection()
+            # Fetch the next queued job together with its config in a single query
             cursor = conn.cursor()
-            cursor.execute("SELECT config FROM job_configs WHERE job_id = ?", (job_id,))
-            config_json = cursor.fetchone()['config']
-            config = json.loads(config_json)
-            cursor.execute("UPDATE jobs SET overall_status = ? WHERE job_id = ?", ('running', job_id))
-            conn.commit()
-            conn.close()
+            cursor.execute("""
+                SELECT j.job_id, c.config FROM jobs j
+                JOIN job_configs c ON c.job_id = j.job_id
+                WHERE j.overall_status = 'queued' ORDER BY j.start_time LIMIT 1
+            """)
+            job = cursor.fetchone()
+            # Finish the statement so no WAL read snapshot is held while idle or exporting
+            cursor.close()
 
-            process_data(job_id, config)
-            
-            # Immediately update job status to prevent reprocessing (race condition fix)
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE jobs SET overall_status = 'completed' WHERE job_id = ? AND overall_status = 'running'", (job_id,))
-            conn.commit()
-            conn.close()
-            logging.info(f"Job {job_id} processing completed and status updated")
-        else:
-            # Wait for a bit before polling again
-            time.sleep(5)
+            if job:
+                job_id = job['job_id']
+                logging.info(f"Found queued job: {job_id}")
+                
+                # Claim the job only if it is still queued, so concurrent pollers never
+                # run the same job twice
+                with conn:
+                    claimed = conn.execute(
+                        "UPDATE jobs SET overall_status = 'running' WHERE job_id = ? AND overall_status = 'queued'",
+                        (job_id,)
+                    ).rowcount
+                if not claimed:
+                    logging.info(f"Job {job_id} was claimed by another worker")
+                    last_version = None
+                    continue
+                
+                config = json.loads(job['config'])
+
+                process_data(job_id, config)
+                
+                # Immediately update job status to prevent reprocessing (race condition fix)
+                with conn:
+                    conn.execute("UPDATE jobs SET overall_status = 'completed' WHERE job_id = ? AND overall_status = 'running'", (job_id,))
+                logging.info(f"Job {job_id} processing completed and status updated")
+                last_version = None
+            else:
+                # Nothing queued as of this version; wait for the next write
+                last_version = version
+                time.sleep(1)
+    finally:
+        conn.close()
 
 if __name__ == '__main__':
     logging.info("Starting worker...")
@@ -13,7 +13,9 @@ backlog = 2048
 
 # Worker processes
 workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = "sync"
+# Set to "eventlet" or "gevent" (with SOCKETIO_ASYNC_MODE to match) for
+# green-thread WebSocket serving; requires that library to be installed
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
 worker_connections = 1000
 timeout = 30
 keepalive = 2
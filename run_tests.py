@@ -7,6 +7,8 @@ Usage:
     python run_tests.py worker       # Run only worker tests
     python run_tests.py app          # Run only app tests  
     python run_tests.py database     # Run only database tests
+    python run_tests.py sqlite_writer  # Run only SQLite writer tests
+    python run_tests.py websocket_manager  # Run only WebSocket manager tests
 """
 
 import unittest
@@ -45,9 +47,9 @@ def run_tests(test_module=None):
 if __name__ == '__main__':
     test_module = sys.argv[1] if len(sys.argv) > 1 else None
     
-    if test_module and test_module not in ['worker', 'app', 'database', 'simple']:
+    if test_module and test_module not in ['worker', 'app', 'database', 'simple', 'sqlite_writer', 'websocket_manager']:
         print(f"Error: Unknown test module '{test_module}'")
-        print("Available modules: worker, app, database, simple")
+        print("Available modules: worker, app, database, simple, sqlite_writer, websocket_manager")
         sys.exit(1)
     
     exit_code = run_tests(test_module)
@@ -85,7 +85,7 @@ fi
 
 # Start Celery worker
 if ! check_service "celery.*worker" "Celery Worker"; then
-    start_service "celery -A adu.celery_config.celery_app worker --loglevel=info --concurrency=8 --max-tasks-per-child=1000" "Celery Worker" "celery" "celery.*worker"
+    start_service "celery -A adu.celery_config.celery_app worker --loglevel=info --concurrency=8 --max-tasks-per-child=1000 --queues=export_jobs,job_control" "Celery Worker" "celery" "celery.*worker"
 fi
 
 # Start Flask application
@@ -17,16 +17,25 @@ cd /app
 mkdir -p /tmp/celery
 mkdir -p /app/logs
 
+# Queue/pool selection: export workers use the default prefork pool; the
+# job_control queue (status/cancel tasks) runs best on a threads pool, e.g.
+#   CELERY_WORKER_NAME=control CELERY_QUEUES=job_control CELERY_POOL=threads CELERY_CONCURRENCY=16
+CELERY_WORKER_NAME=${CELERY_WORKER_NAME:-worker}
+CELERY_QUEUES=${CELERY_QUEUES:-export_jobs}
+CELERY_POOL=${CELERY_POOL:-prefork}
+CELERY_CONCURRENCY=${CELERY_CONCURRENCY:-2}
+
 # Start Celery worker with optimized configuration
 exec celery -A adu.celery_config.celery_app worker \
     --loglevel=info \
-    --logfile=/tmp/celery/worker.log \
-    --pidfile=/tmp/celery/worker.pid \
-    --concurrency=2 \
+    --logfile=/tmp/celery/${CELERY_WORKER_NAME}.log \
+    --pidfile=/tmp/celery/${CELERY_WORKER_NAME}.pid \
+    --pool=${CELERY_POOL} \
+    --concurrency=${CELERY_CONCURRENCY} \
     --prefetch-multiplier=1 \
     --max-tasks-per-child=1000 \
     --without-heartbeat \
     --without-mingle \
     --without-gossip \
-    --queues=export_jobs \
-    --hostname=worker@%h
+    --queues=${CELERY_QUEUES} \
+    --hostname=${CELERY_WORKER_NAME}@%h
@@ -154,6 +154,21 @@ class TestFlaskApp(unittest.TestCase):
         self.assertIn('job_id', data)
         self.assertIn('message', data)
 
+    def test_table_info_rejects_invalid_table_name(self):
+        """Test that table info rejects names that are not plain identifiers"""
+        response = self.client.post('/api/table-info',
+                                  json={
+                                      'db_type': 'postgresql',
+                                      'db_host': 'localhost',
+                                      'db_port': '5432',
+                                      'db_username': 'testuser',
+                                      'db_password': 'testpass',
+                                      'table_name': 'users; DROP TABLE users'
+                                  },
+                                  content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid table name', json.loads(response.data)['error'])
+
 
 class TestApiIntegration(unittest.TestCase):
     """Integration tests for API endpoints"""
@@ -0,0 +1,116 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the project root to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from adu.range_chunking import RangeChunker, RangeInfo
+
+
+class TestRangeBoundaries(unittest.TestCase):
+    """Test cases for range chunk boundary calculation"""
+
+    def ranges(self, min_val, max_val, count):
+        """Split [min_val, max_val] the way the range chunker does"""
+        step = RangeChunker._range_step(min_val, max_val, count)
+        return RangeChunker._contiguous_ranges(min_val, max_val, step, count)
+
+    def assertContiguous(self, ranges, min_val, max_val):
+        """Ranges start at min_val, end at max_val and share their boundaries"""
+        self.assertEqual(ranges[0][0], min_val)
+        self.assertEqual(ranges[-1][1], max_val)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+
+    def test_integer_ranges(self):
+        """Test that integer ranges step by whole values"""
+        ranges = self.ranges(1, 100, 4)
+
+        self.assertEqual(ranges, [(1, 25), (25, 49), (49, 73), (73, 100)])
+
+    def test_narrow_integer_range_is_not_split_below_one(self):
+        """Test that integer steps never drop below 1"""
+        ranges = self.ranges(1, 3, 10)
+
+        self.assertEqual(ranges, [(1, 2), (2, 3)])
+
+    def test_decimal_ranges(self):
+        """Test that numeric columns are divided exactly"""
+        ranges = self.ranges(Decimal('0.00'), Decimal('1.00'), 4)
+
+        self.assertEqual(len(ranges), 4)
+        self.assertContiguous(ranges, Decimal('0.00'), Decimal('1.00'))
+        self.assertEqual(ranges[1], (Decimal('0.25'), Decimal('0.50')))
+
+    def test_small_float_ranges(self):
+        """Test that a float range narrower than the chunk count is still split"""
+        ranges = self.ranges(0.0, 1.0, 4)
+
+        self.assertEqual(ranges, [(0.0, 0.25), (0.25, 0.5), (0.5, 0.75), (0.75, 1.0)])
+
+    def test_date_ranges(self):
+        """Test that date ranges step in whole days and end on the maximum"""
+        min_date, max_date = date(2024, 1, 1), date(2024, 1, 31)
+        ranges = RangeChunker._contiguous_ranges(min_date, max_date, timedelta(days=10), 3)
+
+        self.assertEqual(ranges, [(date(2024, 1, 1), date(2024, 1, 11)),
+                                  (date(2024, 1, 11), date(2024, 1, 21)),
+                                  (date(2024, 1, 21), date(2024, 1, 31))])
+
+    def test_timestamp_ranges(self):
+        """Test that timestamp ranges split to the microsecond"""
+        min_time, max_time = datetime(2024, 1, 1), datetime(2024, 1, 1, 0, 0, 1)
+        ranges = RangeChunker._contiguous_ranges(min_time, max_time, (max_time - min_time) / 3, 3)
+
+        self.assertEqual(len(ranges), 3)
+        self.assertContiguous(ranges, min_time, max_time)
+        self.assertEqual(ranges[1][0], datetime(2024, 1, 1, 0, 0, 0, 333333))
+
+    def test_single_value_range(self):
+        """Test that min == max produces one range covering that value"""
+        self.assertEqual(self.ranges(5, 5, 4), [(5, 5)])
+        self.assertEqual(self.ranges(2.5, 2.5, 4), [(2.5, 2.5)])
+
+    def test_only_final_range_includes_its_end(self):
+        """Test that ranges are half-open except the last, so shared boundaries are exported once"""
+        chunker = RangeChunker('events', RangeInfo('id', 'bigint', 1, 100), 'job-1')
+
+        with patch('adu.range_chunking.get_database_connection', side_effect=Exception('no pool')), \
+                patch('adu.duckdb_exporter.export_table_chunk_duckdb',
+                      return_value=(True, 'ok', 0)) as export:
+            chunker._export_range_chunk(0, 1, 50, Path('/tmp'), True, last=False)
+            chunker._export_range_chunk(1, 50, 100, Path('/tmp'), True, last=True)
+
+        wheres = [call.kwargs['custom_where'] for call in export.call_args_list]
+        self.assertEqual(wheres, ['"id" >= 1 AND "id" < 50', '"id" >= 50 AND "id" <= 100'])
+
+    def test_cancellation_stops_remaining_chunks(self):
+        """Test that chunks not yet started are dropped once the job is cancelled"""
+        chunker = RangeChunker('events', RangeInfo('id', 'bigint', 1, 100), 'job-1',
+                               should_cancel=lambda: True)
+        ranges = [(start, start + 10) for start in range(0, 100, 10)]
+        never_set = threading.Event()
+
+        def export_chunk(chunk_num, *args):
+            # Later chunks are still running when the first one reports back
+            if chunk_num:
+                never_set.wait(0.2)
+            return True, 10
+
+        with patch.object(chunker, '_export_range_chunk', side_effect=export_chunk) as export, \
+                tempfile.TemporaryDirectory() as output_dir:
+            success, rows = chunker.export_with_ranges(Path(output_dir), ranges, max_workers=1)
+
+        self.assertFalse(success)
+        self.assertLessEqual(export.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,550 @@
+import unittest
+import tempfile
+import sqlite3
+import queue
+import threading
+import time
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from adu import sqlite_writer
+from adu.sqlite_writer import SQLiteWriterQueue, SQLiteOperation, SQLiteOperationType
+
+
+class TestSQLiteWriterQueue(unittest.TestCase):
+    """Test cases for the single SQLite writer queue"""
+
+    def setUp(self):
+        """Set up a writer against a temporary database"""
+        self.test_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        self.test_db.close()
+        self.writer = SQLiteWriterQueue(self.test_db.name, batch_size=50, batch_timeout=0.1)
+
+    def tearDown(self):
+        """Shut down the writer and remove the database"""
+        self.writer.shutdown()
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                os.unlink(self.test_db.name + suffix)
+            except FileNotFoundError:
+                pass
+
+    def test_coalesce_job_updates(self):
+        """Test that repeated job updates collapse into one operation"""
+        operations = [
+            SQLiteOperation(SQLiteOperationType.JOB_UPDATE, {'job_id': 'job-1', 'rows_processed': 10}),
+            SQLiteOperation(SQLiteOperationType.TABLE_UPDATE,
+                            {'job_id': 'job-1', 'table_name': 'users', 'rows_processed': 5}),
+            SQLiteOperation(SQLiteOperationType.JOB_UPDATE,
+                            {'job_id': 'job-1', 'rows_processed': 20, 'progress_percent': 40}),
+            SQLiteOperation(SQLiteOperationType.TABLE_UPDATE,
+                            {'job_id': 'job-1', 'table_name': 'users', 'rows_processed': 8}),
+        ]
+
+        coalesced = self.writer._coalesce_batch(operations)
+
+        self.assertEqual(len(coalesced), 2)
+        self.assertEqual(coalesced[0].data, {'job_id': 'job-1', 'rows_processed': 20, 'progress_percent': 40})
+        self.assertEqual(coalesced[1].data['rows_processed'], 8)
+
+    def test_superseded_updates_share_the_survivor_outcome(self):
+        """Test that merged updates are only settled when the update they joined is"""
+        self.writer.shutdown()
+        first, second = (SQLiteOperation(SQLiteOperationType.JOB_UPDATE,
+                                          {'job_id': 'job-1', 'rows_processed': rows},
+                                          result_queue=queue.Queue())
+                         for rows in (10, 20))
+
+        coalesced = self.writer._coalesce_batch([first, second])
+        self.assertEqual(coalesced, [first])
+        self.assertTrue(second.result_queue.empty())
+
+        self.writer._fail_operations(coalesced, Exception('disk full'))
+        self.assertEqual(first.result_queue.get_nowait(), ('error', 'disk full'))
+        self.assertEqual(second.result_queue.get_nowait(), ('error', 'disk full'))
+
+    def test_coalesce_respects_barriers(self):
+        """Test that updates are not merged across a job completion"""
+        operations = [
+            SQLiteOperation(SQLiteOperationType.JOB_UPDATE, {'job_id': 'job-1', 'status': 'running'}),
+            SQLiteOperation(SQLiteOperationType.JOB_COMPLETE, {'job_id': 'job-1', 'end_time': 0}),
+            SQLiteOperation(SQLiteOperationType.JOB_UPDATE, {'job_id': 'job-1', 'rows_processed': 20}),
+        ]
+
+        coalesced = self.writer._coalesce_batch(operations)
+
+        self.assertEqual(len(coalesced), 3)
+        self.assertEqual(coalesced[0].data, {'job_id': 'job-1', 'status': 'running'})
+
+    def test_coalesce_folds_table_completion_into_start(self):
+        """Test that a table started and finished in one batch is written once"""
+        operations = [
+            SQLiteOperation(SQLiteOperationType.TABLE_START,
+                            {'job_id': 'job-1', 'table_name': 'users', 'status': 'processing',
+                             'start_time': 1, 'row_count': 10}),
+            SQLiteOperation(SQLiteOperationType.TABLE_COMPLETE,
+                            {'job_id': 'job-1', 'table_name': 'users', 'end_time': 2,
+                             'rows_processed': 10, 'file_path': '/exports/users'}),
+            SQLiteOperation(SQLiteOperationType.TABLE_START,
+                            {'job_id': 'job-1', 'table_name': 'orders', 'status': 'processing',
+                             'start_time': 1}),
+            SQLiteOperation(SQLiteOperationType.TABLE_UPDATE,
+                            {'job_id': 'job-1', 'table_name': 'orders', 'rows_processed': 5}),
+            SQLiteOperation(SQLiteOperationType.TABLE_FAIL,
+                            {'job_id': 'job-1', 'table_name': 'orders', 'end_time': 2,
+                             'error_message': 'boom'}),
+        ]
+
+        coalesced = self.writer._coalesce_batch(operations)
+
+        self.assertEqual([op.operation_type for op in coalesced],
+                         [SQLiteOperationType.TABLE_START, SQLiteOperationType.TABLE_START,
+                          SQLiteOperationType.TABLE_UPDATE, SQLiteOperationType.TABLE_FAIL])
+        self.assertEqual(coalesced[0].data['status'], 'completed')
+        self.assertEqual(coalesced[0].data['file_path'], '/exports/users')
+
+    def test_folded_table_start_persists_final_state(self):
+        """Test that merged start/completion and start/failure rows hold the final state"""
+        self.writer.table_started('job-1', 'users')
+        self.writer.table_completed('job-1', 'users', rows_processed=10, file_path='/exports/users',
+                                    file_size_mb=1.5)
+        self.writer.table_started('job-1', 'users', row_count=10)
+        self.writer.table_failed('job-1', 'users', 'connection lost')
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        row = conn.execute("SELECT status, rows_processed, file_path, file_size_mb, error_message, "
+                           "end_time IS NOT NULL FROM table_exports WHERE job_id = ?",
+                           ('job-1',)).fetchone()
+        conn.close()
+
+        self.assertEqual(row, ('failed', 0, '/exports/users', 1.5, 'connection lost', 1))
+
+    def test_updates_are_persisted(self):
+        """Test that queued writes reach the database"""
+        self.writer.job_started('job-1', 'testuser', tables_total=2)
+        for rows in range(1, 6):
+            self.writer.job_update('job-1', rows_processed=rows * 100)
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        row = conn.execute("SELECT rows_processed, tables_total FROM jobs WHERE job_id = ?",
+                           ('job-1',)).fetchone()
+        conn.close()
+
+        self.assertEqual(row, (500, 2))
+
+    def test_progress_updates_are_buffered(self):
+        """Test that progress-only updates bypass the queue and are written back"""
+        self.writer.job_started('job-1', 'testuser')
+        self.writer.job_update('job-1', rows_processed=100, progress_percent=10)
+        self.writer.job_update('job-1', rows_processed=200)
+
+        self.assertEqual(self.writer._progress_state['job-1'], {'rows_processed': 200, 'progress_percent': 10})
+
+        self.writer.job_completed('job-1')
+        self.assertNotIn('job-1', self.writer._progress_state)
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        row = conn.execute("SELECT rows_processed, progress_percent, overall_status FROM jobs "
+                           "WHERE job_id = ?", ('job-1',)).fetchone()
+        conn.close()
+
+        self.assertEqual(row, (200, 10, 'completed'))
+
+    def test_concurrent_progress_updates_keep_every_field(self):
+        """Test that progress merged from several threads is not lost, and counters are queued"""
+        self.writer.shutdown()
+
+        def update(field):
+            for value in range(1, 2001):
+                self.writer.job_update('job-1', **{field: value})
+
+        threads = [threading.Thread(target=update, args=(field,))
+                   for field in ('rows_processed', 'progress_percent', 'throughput_rows_per_sec')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.writer._progress_state['job-1'],
+                         {'rows_processed': 2000, 'progress_percent': 2000, 'throughput_rows_per_sec': 2000})
+
+        self.writer.job_update('job-1', tables_completed=1)
+        self.assertNotIn('job-1', self.writer._progress_state)
+        self.assertEqual(self.writer._queue[-1].data['tables_completed'], 1)
+
+    def test_job_start_does_not_overwrite_completed_job(self):
+        """Test that restarting a completed job leaves it untouched"""
+        self.writer.job_started('job-1', 'first-user', tables_total=1)
+        self.writer.job_completed('job-1')
+        self.writer.job_started('job-1', 'second-user', tables_total=5)
+        self.writer.job_started('job-2', 'other-user', tables_total=2)
+        self.writer.job_started('job-2', 'other-user', tables_total=3)
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        rows = conn.execute("SELECT job_id, db_username, tables_total, overall_status FROM jobs "
+                            "ORDER BY job_id").fetchall()
+        conn.close()
+
+        self.assertEqual(rows, [('job-1', 'first-user', 1, 'completed'),
+                                ('job-2', 'other-user', 3, 'running')])
+
+    def test_job_start_marks_queued_job_running(self):
+        """Test that starting a queued job sets status and task id in one write"""
+        self.writer.shutdown()
+        conn = sqlite3.connect(self.test_db.name)
+        conn.execute("INSERT INTO jobs (job_id, db_username, status) VALUES ('job-1', 'testuser', 'queued')")
+        conn.commit()
+        conn.close()
+
+        self.writer = SQLiteWriterQueue(self.test_db.name, batch_size=50, batch_timeout=0.1)
+        self.writer.job_started('job-1', 'testuser', celery_task_id='task-1', tables_total=2)
+        self.writer.job_started('job-1', 'testuser', tables_total=2)
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        row = conn.execute("SELECT status, overall_status, celery_task_id FROM jobs "
+                           "WHERE job_id = ?", ('job-1',)).fetchone()
+        conn.close()
+
+        self.assertEqual(row, ('running', 'running', 'task-1'))
+
+    def test_job_start_keeps_cancellation(self):
+        """Test that a job cancelled before its start write stays cancelled"""
+        self.writer.shutdown()
+        conn = sqlite3.connect(self.test_db.name)
+        conn.execute("INSERT INTO jobs (job_id, db_username, status) VALUES ('job-1', 'testuser', 'cancelled')")
+        conn.commit()
+        conn.close()
+
+        self.writer = SQLiteWriterQueue(self.test_db.name, batch_size=50, batch_timeout=0.1)
+        self.writer.job_started('job-1', 'testuser', celery_task_id='task-1', tables_total=2)
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        row = conn.execute("SELECT status, celery_task_id, tables_total FROM jobs "
+                           "WHERE job_id = ?", ('job-1',)).fetchone()
+        conn.close()
+
+        self.assertEqual(row, ('cancelled', None, 0))
+
+    def test_table_restart_reuses_row(self):
+        """Test that restarting a table export updates its row instead of adding one"""
+        self.writer.table_started('job-1', 'users')
+        self.writer.table_failed('job-1', 'users', 'connection lost')
+        self.writer.table_started('job-1', 'users', row_count=10)
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        rows = conn.execute("SELECT status, row_count, error_message, retry_count FROM table_exports "
+                            "WHERE job_id = ? AND table_name = ?", ('job-1', 'users')).fetchall()
+        conn.close()
+
+        self.assertEqual(rows, [('processing', 10, None, 1)])
+
+    def test_query_reads_directly(self):
+        """Test that queries are served from a read-only connection"""
+        self.writer.job_started('job-1', 'testuser')
+        self.writer.job_update('job-1', rows_processed=42)
+
+        deadline = time.time() + 5
+        row = None
+        while row is None and time.time() < deadline:
+            row = self.writer.query("SELECT rows_processed FROM jobs WHERE job_id = ?",
+                                    ('job-1',), fetchone=True)
+            time.sleep(0.05)
+
+        self.assertEqual(row['rows_processed'], 42)
+        self.assertGreaterEqual(self.writer.get_stats()['total_queries'], 1)
+        with self.assertRaises(Exception):
+            self.writer.query("DELETE FROM jobs")
+
+    def test_reader_connections_released_with_their_threads(self):
+        """Test that a short-lived thread's read-only connection is closed when it exits"""
+        connections = []
+
+        def read():
+            self.writer.query("SELECT COUNT(*) FROM jobs")
+            connections.append(self.writer._get_reader_state().connection)
+
+        for _ in range(20):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(len(connections), 20)
+        self.assertEqual(len(self.writer._reader_states), 0)
+        self.assertEqual(self.writer.get_stats()['total_queries'], 20)
+        for connection in connections:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                connection.execute("SELECT 1")
+
+    def test_batch_context_applies_operations(self):
+        """Test that operations collected in a batch context are written together"""
+        with self.writer.batch_context() as batch:
+            batch.add_operation(SQLiteOperationType.JOB_START, {
+                'job_id': 'job-1', 'status': 'running', 'start_time': int(time.time())
+            })
+            batch.add_operation(SQLiteOperationType.TABLE_START, {
+                'job_id': 'job-1', 'table_name': 'users', 'status': 'processing',
+                'start_time': int(time.time())
+            })
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        jobs = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        tables = conn.execute("SELECT COUNT(*) FROM table_exports").fetchone()[0]
+        conn.close()
+
+        self.assertEqual((jobs, tables), (1, 1))
+
+    def test_batched_table_updates_applied_in_order(self):
+        """Test that runs of table updates in a batch are all applied around other operations"""
+        self.writer.table_started('job-1', 'users')
+        self.writer.table_started('job-1', 'orders')
+        with self.writer.batch_context() as batch:
+            batch.add_operation(SQLiteOperationType.TABLE_UPDATE, {
+                'job_id': 'job-1', 'table_name': 'users', 'file_path': '/final/users.parquet'
+            })
+            batch.add_operation(SQLiteOperationType.TABLE_UPDATE, {
+                'job_id': 'job-1', 'table_name': 'orders', 'file_path': '/final/orders.parquet'
+            })
+            batch.add_operation(SQLiteOperationType.TABLE_UPDATE, {
+                'job_id': 'job-1', 'table_name': 'orders', 'status': 'completed'
+            })
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        rows = conn.execute("SELECT table_name, file_path, status FROM table_exports "
+                            "ORDER BY table_name").fetchall()
+        conn.close()
+
+        self.assertEqual(rows, [('orders', '/final/orders.parquet', 'completed'),
+                                ('users', '/final/users.parquet', 'processing')])
+
+    def test_flush_requeues_on_operational_error(self):
+        """Test that a locked database requeues the batch instead of dropping it"""
+        self.writer.shutdown()
+        self.writer._batch_operations.append(
+            SQLiteOperation(SQLiteOperationType.JOB_UPDATE, {'job_id': 'job-1', 'rows_processed': 1})
+        )
+
+        blocker = sqlite3.connect(self.test_db.name)
+        blocker.execute("BEGIN EXCLUSIVE")
+        self.writer._connection = sqlite3.connect(self.test_db.name, timeout=0)
+        self.writer._cursor = self.writer._connection.cursor()
+        try:
+            self.writer._flush_batch()
+        finally:
+            blocker.rollback()
+            blocker.close()
+            self.writer._connection.close()
+
+        self.assertEqual(len(self.writer._queue), 1)
+        self.assertEqual(self.writer._flush_failures, 1)
+
+    def test_bad_statement_rejects_only_its_operation(self):
+        """Test that a permanent OperationalError fails one operation without retrying the batch"""
+        self.writer.shutdown()
+        bad = SQLiteOperation(SQLiteOperationType.JOB_UPDATE, {'job_id': 'job-1', 'no_such_column': 1},
+                              result_queue=queue.Queue())
+        good = SQLiteOperation(SQLiteOperationType.JOB_START,
+                               {'job_id': 'job-1', 'status': 'running', 'start_time': 0},
+                               result_queue=queue.Queue())
+        self.writer._connection = sqlite3.connect(self.test_db.name)
+        self.writer._cursor = self.writer._connection.cursor()
+        self.writer._batch_operations.extend([bad, good])
+        try:
+            self.assertEqual(self.writer._flush_batch(), 0)
+        finally:
+            self.writer._connection.close()
+
+        self.assertEqual(self.writer._flush_failures, 0)
+        self.assertEqual(bad.result_queue.get_nowait()[0], 'error')
+        self.assertEqual(good.result_queue.get_nowait(), ('success', None))
+
+    def test_batch_runs_after_requeued_operations(self):
+        """Test that a batch waits behind earlier writes requeued by its pre-flush"""
+        self.writer.shutdown()
+        earlier = SQLiteOperation(SQLiteOperationType.JOB_START,
+                                  {'job_id': 'job-1', 'status': 'running', 'start_time': 0})
+        batch = SQLiteOperation(SQLiteOperationType.BATCH, {'operations': [
+            SQLiteOperation(SQLiteOperationType.JOB_UPDATE, {'job_id': 'job-1', 'status': 'done'})
+        ]})
+        self.writer._batch_operations.append(earlier)
+
+        blocker = sqlite3.connect(self.test_db.name)
+        blocker.execute("BEGIN EXCLUSIVE")
+        self.writer._connection = sqlite3.connect(self.test_db.name, timeout=0)
+        self.writer._cursor = self.writer._connection.cursor()
+        try:
+            self.writer._process_batch_operation(batch)
+            self.assertEqual(list(self.writer._queue), [earlier, batch])
+
+            blocker.rollback()
+            self.writer._process_operations()
+        finally:
+            blocker.close()
+            self.writer._connection.close()
+
+        conn = sqlite3.connect(self.test_db.name)
+        row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", ('job-1',)).fetchone()
+        conn.close()
+
+        self.assertEqual(row, ('done',))
+
+    def test_rejected_rows_reported_after_requeued_retry(self):
+        """Test that a row rejected in a batch that is requeued is only reported once, after the retry"""
+        self.writer.shutdown()
+        bad = SQLiteOperation(SQLiteOperationType.JOB_START, {}, result_queue=queue.Queue())
+        good = SQLiteOperation(SQLiteOperationType.JOB_START,
+                               {'job_id': 'job-1', 'status': 'running', 'start_time': 0},
+                               result_queue=queue.Queue())
+        self.writer._batch_operations.extend([bad, good])
+
+        blocker = sqlite3.connect(self.test_db.name)
+        blocker.execute("BEGIN EXCLUSIVE")
+        self.writer._connection = sqlite3.connect(self.test_db.name, timeout=0)
+        self.writer._cursor = self.writer._connection.cursor()
+        try:
+            self.writer._flush_batch()
+            self.assertTrue(bad.result_queue.empty())
+            self.assertEqual(list(self.writer._queue), [bad, good])
+
+            blocker.rollback()
+            self.writer._batch_operations.extend(self.writer._queue)
+            self.writer._queue.clear()
+            self.writer._flush_batch()
+        finally:
+            blocker.close()
+            self.writer._connection.close()
+
+        self.assertEqual(bad.result_queue.get_nowait()[0], 'error')
+        self.assertTrue(bad.result_queue.empty())
+        self.assertEqual(good.result_queue.get_nowait(), ('success', None))
+
+    def test_timestamps_stored_as_datetime_text(self):
+        """Test that epoch timestamps from producers are stored in DATETIME format"""
+        self.writer.job_started('job-1', 'testuser')
+        self.writer.log_error('job-1', 'boom')
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        start_time = conn.execute("SELECT start_time FROM jobs WHERE job_id = ?", ('job-1',)).fetchone()[0]
+        error_time = conn.execute("SELECT timestamp FROM errors WHERE job_id = ?", ('job-1',)).fetchone()[0]
+        conn.close()
+
+        self.assertRegex(start_time, r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+        self.assertRegex(error_time, r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+
+    def test_identical_tracebacks_stored_once(self):
+        """Test that repeated tracebacks share one tracebacks row"""
+        for table in ('users', 'orders', 'items'):
+            self.writer.log_error('job-1', f'{table} failed', 'Traceback: auth failed')
+        self.writer.log_error('job-1', 'no traceback')
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        stored = conn.execute("SELECT COUNT(*) FROM tracebacks").fetchone()[0]
+        rows = conn.execute(
+            "SELECT COALESCE(t.traceback, e.traceback) FROM errors e "
+            "LEFT JOIN tracebacks t ON t.traceback_hash = e.traceback_hash ORDER BY e.id"
+        ).fetchall()
+        conn.close()
+
+        self.assertEqual(stored, 1)
+        self.assertEqual(rows, [('Traceback: auth failed',)] * 3 + [(None,)])
+
+    def test_errors_table_migrated_for_traceback_hash(self):
+        """Test that an errors table from before deduplication gains the hash column"""
+        self.writer.shutdown()
+        conn = sqlite3.connect(self.test_db.name)
+        conn.execute("DROP TABLE errors")
+        conn.execute("CREATE TABLE errors (id INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT, "
+                     "timestamp DATETIME, error_message TEXT, traceback TEXT, context TEXT)")
+        conn.commit()
+        conn.close()
+
+        self.writer = SQLiteWriterQueue(self.test_db.name, batch_size=50, batch_timeout=0.1)
+        self.writer.log_error('job-1', 'boom', 'Traceback: boom')
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        row = conn.execute("SELECT traceback, traceback_hash IS NOT NULL FROM errors").fetchone()
+        conn.close()
+
+        self.assertEqual(row, (None, 1))
+
+    def test_table_export_attempts_migrated_to_history(self):
+        """Test that per-attempt table_exports rows are archived, not deleted, before the unique index"""
+        self.writer.shutdown()
+        conn = sqlite3.connect(self.test_db.name)
+        conn.execute("DROP INDEX idx_table_exports_job_table")
+        conn.executemany("INSERT INTO table_exports (job_id, table_name, status) VALUES (?, ?, ?)",
+                         [('job-1', 'users', 'failed'), ('job-1', 'users', 'failed'),
+                          ('job-1', 'users', 'completed'), ('job-1', 'orders', 'completed')])
+        conn.commit()
+        conn.close()
+
+        self.writer = SQLiteWriterQueue(self.test_db.name, batch_size=50, batch_timeout=0.1)
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        current = conn.execute("SELECT table_name, status, retry_count FROM table_exports "
+                               "ORDER BY table_name").fetchall()
+        history = conn.execute("SELECT table_name, status FROM table_exports_history").fetchall()
+        conn.close()
+
+        self.assertEqual(current, [('orders', 'completed', 0), ('users', 'completed', 2)])
+        self.assertEqual(history, [('users', 'failed'), ('users', 'failed')])
+
+    def test_job_update_accepts_epoch_timestamps(self):
+        """Test that epoch values for DATETIME columns are stored as text"""
+        self.writer.job_started('job-1', 'testuser')
+        self.writer.job_update('job-1', status='cancelled', end_time=int(time.time()))
+        self.writer.shutdown()
+
+        conn = sqlite3.connect(self.test_db.name)
+        end_time = conn.execute("SELECT end_time FROM jobs WHERE job_id = ?", ('job-1',)).fetchone()[0]
+        conn.close()
+
+        self.assertRegex(end_time, r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+
+    def test_periodic_wal_checkpoint(self):
+        """Test that the writer thread checkpoints the WAL once the interval has passed"""
+        started = self.writer._last_checkpoint_time
+        self.writer.CHECKPOINT_INTERVAL = 0.0
+        self.writer.job_started('job-1', 'testuser')
+
+        deadline = time.time() + 5
+        while self.writer._last_checkpoint_time == started and time.time() < deadline:
+            time.sleep(0.05)
+
+        self.assertGreater(self.writer._last_checkpoint_time, started)
+
+    def test_global_writer_is_rebuilt_after_fork(self):
+        """Test that a forked process gets its own writer instead of the parent's"""
+        with patch.dict(os.environ, {'ADU_DB_PATH': self.test_db.name}), \
+                patch.object(sqlite_writer, '_sqlite_writer', None), \
+                patch.object(sqlite_writer, '_writer_pid', None):
+            parent_writer = sqlite_writer.get_sqlite_writer()
+            self.assertIs(sqlite_writer.get_sqlite_writer(), parent_writer)
+
+            with patch('adu.sqlite_writer.os.getpid', return_value=os.getpid() + 1):
+                child_writer = sqlite_writer.get_sqlite_writer()
+                self.assertIsNot(child_writer, parent_writer)
+                sqlite_writer.shutdown_sqlite_writer()
+
+            self.assertIsNone(sqlite_writer._sqlite_writer)
+            parent_writer.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
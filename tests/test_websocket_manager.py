@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+# Add the project root to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from adu.websocket_manager import WebSocketManager
+
+
+class TestWebSocketManager(unittest.TestCase):
+    """Test cases for WebSocket broadcasting"""
+
+    def setUp(self):
+        """Set up a manager with a mocked SocketIO server"""
+        self.manager = WebSocketManager()
+        self.manager.socketio = MagicMock()
+
+    def test_broadcast_skips_jobs_without_subscribers(self):
+        """Test that the web process only emits to jobs with subscribers"""
+        self.manager.broadcast_job_status('job-1', 'running')
+        self.manager.socketio.emit.assert_not_called()
+
+        self.manager.active_connections['job-1'] = {'sid-1'}
+        self.manager.broadcast_job_status('job-1', 'running')
+        self.assertEqual(self.manager.socketio.emit.call_count, 1)
+
+    def test_external_emitter_always_publishes(self):
+        """Test that worker-side emitters publish without local subscriber tracking"""
+        self.manager._external = True
+        self.manager.broadcast_job_status('job-1', 'running')
+
+        self.assertEqual(self.manager.socketio.emit.call_count, 1)
+
+    def test_progress_broadcasts_are_coalesced(self):
+        """Test that progress updates within one window produce a single emit"""
+        self.manager.active_connections['job-1'] = {'sid-1'}
+        self.manager.broadcast_job_progress('job-1', {'job_id': 'job-1', 'rows_processed': 10})
+        self.manager.broadcast_job_progress('job-1', {'job_id': 'job-1', 'rows_processed': 20,
+                                                      'progress_percent': 50})
+
+        self.manager.socketio.start_background_task.assert_called_once()
+        task, job_id = self.manager.socketio.start_background_task.call_args.args
+        task(job_id)
+
+        self.manager.socketio.emit.assert_called_once_with(
+            'job_progress', {'job_id': 'job-1', 'rows_processed': 20, 'progress_percent': 50},
+            room='job-1'
+        )
+        self.assertEqual(self.manager._pending_progress, {})
+
+    def test_publish_without_message_queue_is_noop(self):
+        """Test that publishing without a configured message queue does not raise"""
+        manager = WebSocketManager()
+        with patch.dict(os.environ, {}, clear=True):
+            manager.publish_job_status('job-1', 'completed')
+
+        self.assertIsNone(manager.socketio)
+
+    def test_disconnect_clears_only_session_subscriptions(self):
+        """Test that a disconnect removes the session from just the jobs it joined"""
+        app = Flask(__name__)
+        with patch.dict(os.environ, {}, clear=True):
+            manager = WebSocketManager(app)
+
+        first = manager.socketio.test_client(app)
+        second = manager.socketio.test_client(app)
+        first.emit('subscribe_job', {'job_id': 'job-1'})
+        first.emit('subscribe_job', {'job_id': 'job-2'})
+        second.emit('subscribe_job', {'job_id': 'job-2'})
+        second.emit('subscribe_job', {'job_id': 'job-2'})
+        self.assertEqual(manager.get_active_job_subscribers(), {'job-1': 1, 'job-2': 2})
+
+        first.disconnect()
+
+        self.assertEqual(manager.get_active_job_subscribers(), {'job-2': 1})
+        self.assertEqual(len(manager._session_jobs), 1)
+        second.disconnect()
+
+
+if __name__ == '__main__':
+    unittest.main()
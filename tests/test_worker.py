@@ -86,14 +86,6 @@ class TestWorker(unittest.TestCase):
         success, message = validate_data(df, 'test_table_nulls')
         # Should pass since our schema allows nulls
         self.assertTrue(success)
-    
-    def test_redact_sensitive_data_non_string(self):
-        """Test redaction with non-string input"""
-        result = redact_sensitive_data(12345)
-        self.assertEqual(result, '12345')
-        
-        result = redact_sensitive_data(None)
-        self.assertEqual(result, 'None')
 
 
 class TestDataValidation(unittest.TestCase):